@@ -1,17 +1,20 @@
 import os
 import logging
-import linecache
+import functools
+import collections
 import datetime
-import netCDF4
+import mmap
 import subprocess
 import shutil
 import numpy as np
 import json
-import geojson
+import re
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import matplotlib.pyplot as plt
-from matplotlib import path
-from matplotlib import patches
-import matplotlib._contour as cntr
+from matplotlib.collections import LineCollection, PolyCollection
 
 __author__ = 'ctroupin (GHER, ULg)'
 """Module for running Diva2D, including:
@@ -46,12 +49,330 @@ def divalogger(logname, logfile):
     return logger
 
 
+@functools.lru_cache(None)
+def _get_logger(logname):
+    """Create the log directory and the logger the first time it is needed
+    :param logname: name of the logger
+    :type logname: str
+    """
+    os.makedirs(logdir, exist_ok=True)
+    logger = divalogger(logname, logfile)
+    logger.info("Logs written in file: %s", logfile)
+    return logger
+
+
+class _LazyLogger(object):
+    """Proxy to the logger, which is only created (along with the log directory
+    and file) when a message is logged for the first time
+    """
+
+    def __init__(self, logname):
+        self.logname = logname
+
+    def __getattr__(self, name):
+        return getattr(_get_logger(self.logname), name)
+
+
 logdir = "./logs/"
-if not os.path.exists(logdir):
-    os.makedirs(logdir)
 logfile = ''.join((logdir, 'Diva_', datetime.datetime.now().strftime('%Y-%m-%d_%H:%M:%S'), '.log'))
-logger = divalogger(__name__, logfile)
-logger.info("Logs written in file: {0}".format(logfile))
+logger = _LazyLogger(__name__)
+
+
+def _coerce(values, name):
+    """Convert a list or an array of values to a 1D numpy array,
+    without copy if it is already an array
+    :param values: input values
+    :type values: list or numpy ndarray
+    :param name: name of the values (for the error message)
+    :type name: str
+    :return: numpy ndarray
+    """
+    values = np.asarray(values)
+    if values.ndim != 1:
+        logger.error("Not a valid type for %s", name)
+        raise Exception("Not a valid type for {0}".format(name))
+    return values
+
+
+def _pack_contours(values):
+    """Store a list of sub-contour coordinates into a single contiguous array
+    :param values: coordinates of each sub-contour
+    :type values: list of lists or numpy ndarrays
+    :return: flat: numpy ndarray with the coordinates of all the sub-contours
+    :return: offsets: numpy ndarray with the position of each sub-contour in 'flat'
+    """
+    if values is None:
+        return None, None
+    npoints = np.array([len(v) for v in values], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(npoints)))
+    if len(npoints):
+        flat = np.concatenate([np.asarray(v, dtype=np.float64) for v in values])
+    else:
+        flat = np.empty(0, dtype=np.float64)
+    return flat, offsets
+
+
+def _unpack_contours(flat, offsets):
+    """Split the contiguous coordinate array into the sub-contours (without copy)
+    :param flat: numpy ndarray with the coordinates of all the sub-contours
+    :param offsets: numpy ndarray with the position of each sub-contour in 'flat'
+    :return: list of numpy ndarrays
+    """
+    if flat is None:
+        return None
+    return [flat[offsets[i]:offsets[i + 1]] for i in range(0, len(offsets) - 1)]
+
+
+def _close_contours(flat, offsets):
+    """Append the first point of each sub-contour at its end
+    :param flat: numpy ndarray with the coordinates of all the sub-contours
+    :param offsets: numpy ndarray with the position of each sub-contour in 'flat'
+    :return: closedflat: numpy ndarray with the coordinates of the closed sub-contours
+    :return: closedoffsets: numpy ndarray with the position of each closed sub-contour
+    """
+    ncontours = len(offsets) - 1
+    closedoffsets = offsets + np.arange(ncontours + 1)
+    # Index in 'flat' of each value of the closed sub-contours
+    indices = np.arange(closedoffsets[-1]) - np.repeat(np.arange(ncontours), np.diff(closedoffsets))
+    indices[closedoffsets[1:] - 1] = offsets[:-1]
+    closedflat = np.empty(closedoffsets[-1], dtype=flat.dtype)
+    np.take(flat, indices, out=closedflat)
+    return closedflat, closedoffsets
+
+
+_netCDF4 = None
+
+
+def _nc():
+    """Import netCDF4 the first time a netCDF file is read
+    (the module is slow to import and not needed for the other files)
+    :return: netCDF4 module
+    """
+    global _netCDF4
+    if _netCDF4 is None:
+        import netCDF4 as _netCDF4
+    return _netCDF4
+
+
+_contourpy = None
+
+
+def _contour_generator(x, y, field):
+    """Create the contour generator of a field, importing contourpy only when
+    the contours of a result are computed (it comes with matplotlib >= 3.6)
+    :param x: x-coordinates
+    :type x: numpy ndarray
+    :param y: y-coordinates
+    :type y: numpy ndarray
+    :param field: field to be contoured (2D)
+    :type field: numpy ndarray
+    :return: contourpy.ContourGenerator
+    """
+    global _contourpy
+    if _contourpy is None:
+        import contourpy as _contourpy
+    return _contourpy.contour_generator(x, y, field, name='serial', line_type='Separate')
+
+
+# Powers of 10 exactly representable as floats, used to convert the decimal values
+_POW10 = np.array([1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+                   1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22])
+
+
+def _parse_float(buf, start, end):
+    """Convert the bytes buf[start:end] to a float.
+
+    Only the values that can be converted exactly (at most 15 significant digits
+    and a decimal exponent not larger than 22) are accepted.
+    :return: ok: False if the value could not be converted
+    :return: value: float
+    """
+    i = start
+    sign = 1.
+    if buf[i] == 45 or buf[i] == 43:  # '-' or '+'
+        if buf[i] == 45:
+            sign = -1.
+        i += 1
+    mantissa = 0
+    nread = 0
+    ndigits = 0
+    nfrac = 0
+    infrac = False
+    while i < end:
+        c = buf[i]
+        if 48 <= c <= 57:
+            nread += 1
+            if ndigits > 0 or c != 48:
+                ndigits += 1
+            mantissa = 10 * mantissa + (c - 48)
+            if infrac:
+                nfrac += 1
+        elif c == 46 and not infrac:  # '.'
+            infrac = True
+        else:
+            break
+        i += 1
+    exponent = 0
+    if i < end and (buf[i] == 101 or buf[i] == 69):  # 'eE'
+        i += 1
+        expsign = 1
+        if i < end and (buf[i] == 45 or buf[i] == 43):
+            if buf[i] == 45:
+                expsign = -1
+            i += 1
+        if i == end:
+            return False, 0.
+        while i < end and 48 <= buf[i] <= 57:
+            exponent = 10 * exponent + (buf[i] - 48)
+            i += 1
+        exponent *= expsign
+    if i != end or nread == 0 or ndigits > 15:
+        return False, 0.
+    exponent -= nfrac
+    if exponent < -22 or exponent > 22:
+        return False, 0.
+    if exponent < 0:
+        return True, sign * mantissa / _POW10[-exponent]
+    return True, sign * mantissa * _POW10[exponent]
+
+
+def _parse_data_buffer(buf, x, y, field, weight):
+    """Fill the arrays with the values of a DIVA data file stored in buf
+    (uint8 array). The parsing stops at the first line with less than 3 columns.
+    :return: number of data points read, -1 if a value could not be converted
+    """
+    n = buf.size
+    values = np.empty(4)
+    i = 0
+    ndata = 0
+    while i < n:
+        ncols = 0
+        while i < n and buf[i] != 10:
+            c = buf[i]
+            if c == 32 or c == 9 or c == 13:
+                i += 1
+                continue
+            start = i
+            while i < n and buf[i] != 10 and buf[i] != 32 and buf[i] != 9 and buf[i] != 13:
+                i += 1
+            if ncols < 4:
+                ok, value = _parse_float(buf, start, i)
+                if not ok:
+                    return -1
+                values[ncols] = value
+            ncols += 1
+        i += 1
+        if ncols < 3:
+            break
+        x[ndata] = values[0]
+        y[ndata] = values[1]
+        field[ndata] = values[2]
+        weight[ndata] = values[3] if ncols >= 4 else 1.
+        ndata += 1
+    return ndata
+
+
+_numba = None
+# Replaced by numba.prange to compile the parallel loops
+_prange = range
+
+
+def _load_numba():
+    """Import numba and compile the functions that use it the first time they
+    are needed (the module is slow to import and optional)
+    :return: True if numba is installed
+    """
+    global _numba, _prange, _parse_float, _parse_data_buffer, _centroids_loop
+    if _numba is None:
+        try:
+            import numba as _numba
+        except ImportError:
+            _numba = False
+            return False
+        _parse_float = _numba.njit(cache=True)(_parse_float)
+        _parse_data_buffer = _numba.njit(cache=True)(_parse_data_buffer)
+        _prange = _numba.prange
+        _centroids_loop = _numba.njit(parallel=True, cache=True)(_centroids_loop)
+    return _numba is not False
+
+
+def _json_default(obj):
+    """Convert the numpy objects that the JSON encoder cannot serialize directly
+    :param obj: numpy array or scalar
+    :return: list or Python scalar
+    """
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+
+def _json_dumps(obj, indent=True):
+    """Serialize an object to a JSON formatted string, using orjson if available.
+    Numpy arrays can be passed directly, without conversion to lists.
+
+    The two encoders give the same values, but not always the same text:
+    orjson writes e.g. 1e16 and 0.00001 where json writes 1e+16 and 1e-05.
+    :param obj: object to serialize
+    :param indent: if True, indent with 2 spaces, else write the most compact form
+    :type indent: bool
+    :return: str
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_json_default, option=option).decode()
+    if indent:
+        return json.dumps(obj, indent=2, separators=(',', ': '), default=_json_default)
+    return json.dumps(obj, separators=(',', ':'), default=_json_default)
+
+
+# Number of elements (data points, triangles) serialized at once when writing geoJSON
+_GEOJSON_BLOCK = 65536
+
+
+def _write_json_blocks(f, obj, key, blocks):
+    """Write a JSON object into an open file, serializing the elements of its last
+    member by blocks so that the whole string is never stored in memory.
+
+    The layout is the same as 'json.dumps' with 'indent=2'.
+    :param f: file object
+    :param obj: dictionary with the first members of the JSON object
+    :type obj: dict
+    :param key: name of the last member of the JSON object
+    :type key: str
+    :param blocks: lists of consecutive elements of the last member
+    :type blocks: iterable
+    """
+    f.write('{\n')
+    for k, v in obj.items():
+        f.write(''.join(('  ', json.dumps(k), ': ', _json_dumps(v).replace('\n', '\n  '), ',\n')))
+    f.write(''.join(('  ', json.dumps(key), ': [')))
+    empty = True
+    for block in blocks:
+        if not len(block):
+            continue
+        # Elements of the block, without the enclosing brackets
+        text = _json_dumps(block).replace('\n', '\n  ')[1:-4]
+        f.write(text if empty else ',' + text)
+        empty = False
+    f.write(']\n}' if empty else '\n  ]\n}')
+
+
+def _write_json_stream(f, obj, key, items):
+    """Write a JSON object into an open file, serializing the elements of its last
+    member one at a time so that the whole string is never stored in memory.
+
+    The layout is the same as 'json.dumps' with 'indent=2'.
+    :param f: file object
+    :param obj: dictionary with the first members of the JSON object
+    :type obj: dict
+    :param key: name of the last member of the JSON object
+    :type key: str
+    :param items: elements of the last member
+    :type items: iterable
+    """
+    _write_json_blocks(f, obj, key, ([item] for item in items))
 
 
 class DivaDirectories(object):
@@ -68,22 +389,22 @@ class DivaDirectories(object):
 
         if os.path.isdir(divamain):
             self.divamain = divamain
-            logger.debug("{0} exists".format(self.divamain))
+            logger.debug("%s exists", self.divamain)
             self.divabin = os.path.join(self.divamain, 'DIVA3D/bin')
             self.divasrc = os.path.join(self.divamain, 'DIVA3D/src/Fortran')
             self.diva2d = os.path.join(self.divamain, 'DIVA3D/divastripped')
             self.diva4d = os.path.join(self.divamain, 'JRA4/Climatology')
             self.divaexample = os.path.join(self.divamain, 'Example4D/')
 
-            logger.info('Diva main directory: {0}'.format(self.divamain))
+            logger.info('Diva main directory: %s', self.divamain)
             logger.info('Creating Diva directory paths')
-            logger.info("Binary directory:   {0}".format(self.divabin))
-            logger.info("Source directory:   {0}".format(self.divasrc))
-            logger.info("Main 2D directory:  {0}".format(self.diva2d))
-            logger.info("Main 4D directory:  {0}".format(self.diva4d))
-            logger.info("Example directory:  {0}".format(self.divaexample))
+            logger.info("Binary directory:   %s", self.divabin)
+            logger.info("Source directory:   %s", self.divasrc)
+            logger.info("Main 2D directory:  %s", self.diva2d)
+            logger.info("Main 4D directory:  %s", self.diva4d)
+            logger.info("Example directory:  %s", self.divaexample)
         else:
-            logger.error("{0} is not a directory or doesn't exist".format(divamain))
+            logger.error("%s is not a directory or doesn't exist", divamain)
 
 
 class Diva2Dfiles(object):
@@ -107,15 +428,33 @@ class Diva2Dfiles(object):
             self.mesh = os.path.join(self.diva2d, 'meshgenwork/fort.22')
             self.meshtopo = os.path.join(self.diva2d, 'meshgenwork/fort.23')
             logger.info("Creating Diva 2D file names and paths")
-            logger.info("Contour file:   {0}".format(self.contour))
-            logger.info("Parameter file: {0}".format(self.parameter))
-            logger.info("Data file:      {0}".format(self.data))
-            logger.info("Valatxy file:   {0}".format(self.valatxy))
-            logger.info("Result file:    {0}".format(self.result))
-            logger.info("Mesh file:      {0}".format(self.mesh))
-            logger.info("Mesh topo file: {0}".format(self.meshtopo))
+            logger.info("Contour file:   %s", self.contour)
+            logger.info("Parameter file: %s", self.parameter)
+            logger.info("Data file:      %s", self.data)
+            logger.info("Valatxy file:   %s", self.valatxy)
+            logger.info("Result file:    %s", self.result)
+            logger.info("Mesh file:      %s", self.mesh)
+            logger.info("Mesh topo file: %s", self.meshtopo)
         else:
-            logger.error("%{0} is not a directory or doesn't exist".format(self.diva2d))
+            logger.error("%s is not a directory or doesn't exist", self.diva2d)
+
+
+# Blank line followed by other values
+_BLANK_LINE = re.compile(rb'(?:\A|\n)[ \t\r]*\n\s*\S')
+
+
+def _has_blank_line(filename):
+    """Check if a file contains a blank line before its last values
+    (the file is memory-mapped and scanned at once)
+    :param filename: name of the file
+    :type filename: str
+    :return: bool
+    """
+    if os.path.getsize(filename) == 0:
+        return False
+    with open(filename, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _BLANK_LINE.search(mm) is not None
 
 
 class Diva2DData(object):
@@ -136,70 +475,25 @@ class Diva2DData(object):
         """
 
         logger.info("Creating Diva 2D data object")
-        if x is None:
-            logger.info("X vector not defined")
-            self.x = x
-        elif isinstance(x, np.ndarray):
-            pass
-        elif isinstance(x, list):
-            x = np.array(x)
-        else:
-            logger.error("Not a valid type for x coordinates")
-            raise Exception("Not a valid type for x coordinates")
-
-        if y is None:
-            logger.info("Y vector not defined")
-            self.y = y
-        elif isinstance(y, np.ndarray):
-            pass
-        elif isinstance(y, list):
-            y = np.array(y)
-        else:
-            logger.error("Not a valid type for x coordinates")
-            raise Exception("Not a valid type for x coordinates")
-
-        if field is None:
-            logger.info("Data values not defined")
-            self.field = field
+        if (x is None) or (y is None) or (field is None):
+            logger.info("Coordinates, data and weights set to None")
             self.x = None
             self.y = None
-        elif isinstance(field, np.ndarray):
-            pass
-        elif isinstance(field, list):
-            field = np.array(field)
-        else:
-            logger.error("Not a valid type for data values")
-            raise Exception("Not a valid type for x coordinates")
-
-        if (field is None) & (weight is None):
-            logger.info("Data weights not defined")
-            self.weight = weight
             self.field = None
-            self.x = None
-            self.y = None
-        elif (weight is None) & (field is not None):
-            weight = np.array([1] * len(field))
-            logger.info("Weight set to 1 for all data points")
-        elif isinstance(weight, np.ndarray):
-            pass
-        elif isinstance(weight, list):
-            weight = np.array(weight)
+            self.weight = None
         else:
-            logger.error("Not a valid type for weight")
-            raise Exception("Not a valid type for weight")
-
-        try:
-            if (len(x) == len(y)) & (len(x) == len(field)) & (len(field) == len(weight)):
-                self.x = x
-                self.y = y
-                self.field = field
-                self.weight = weight
+            self.x = _coerce(x, "x coordinates")
+            self.y = _coerce(y, "y coordinates")
+            self.field = _coerce(field, "data values")
+            if weight is None:
+                logger.info("Weight set to 1 for all data points")
+                self.weight = np.ones_like(self.field)
             else:
+                self.weight = _coerce(weight, "weight")
+
+            if len(set(map(len, (self.x, self.y, self.field, self.weight)))) != 1:
                 logger.error("Input vectors have not the same length")
                 raise Exception("Input vectors have not the same length")
-        except TypeError:
-            # If the values are all None
-            logger.info("Coordinates, data and weights set to None")
 
     def write_to(self, filename):
         """Write the data positions and valies into the selected file .
@@ -207,10 +501,8 @@ class Diva2DData(object):
         :type filename: str
         :return:
         """
-        with open(filename, 'w') as f:
-            for xx, yy, zz, ww in zip(self.x, self.y, self.field, self.weight):
-                f.write("%s %s %s %s\n" % (xx, yy, zz, ww))
-        logger.info("Written data into file {0}".format(filename))
+        np.savetxt(filename, np.column_stack((self.x, self.y, self.field, self.weight)), fmt="%.17g")
+        logger.info("Written data into file %s", filename)
 
     def read_from_slow(self, filename):
         """Read the information contained in a DIVA data file
@@ -230,39 +522,97 @@ class Diva2DData(object):
         """Read the information contained in a DIVA data file
         lon, lat, field, (weight).
 
-        This function uses python lists and convert them to 'ndarrays' once the
-        file is read.
+        The number of columns is detected from the first line, then the whole
+        file is parsed at once with 'numpy.loadtxt'.
+        As in 'read_from_lines', the reading stops at the first blank line.
+        If the weights are not provided, they are set to 1.
+        Files that 'numpy.loadtxt' cannot parse (e.g. with a varying number of
+        columns, such as weights provided only on some lines) are read line by
+        line with 'read_from_lines'.
         :param filename: name of the 'data' file
         :type filename: str
         """
 
-        lon, lat, field, weight = [], [], [], []
-
         if os.path.exists(filename):
-            logger.info("Reading data from file {0}".format(filename))
-            with open(filename, 'r') as f:
-                line = f.readline()
-                ncols = len(line.split())
-                while ncols >= 3:
-                    lon.append(float(line.split()[0]))
-                    lat.append(float(line.split()[1]))
-                    field.append(float(line.split()[2]))
-                    if ncols >= 4:
-                        weight.append(float(line.split()[3]))
-                    else:
-                        weight.append(1.)
-                    line = f.readline()
-                    ncols = len(line.split())
-
-            self.x = np.array(lon)
-            self.y = np.array(lat)
-            self.field = np.array(field)
-            self.weight = np.array(weight)
+            logger.info("Reading data from file %s", filename)
+            if _has_blank_line(filename):
+                # 'numpy.loadtxt' would skip the blank lines, while the reading
+                # has to stop at the first one
+                logger.debug("Blank line in %s, reading it line by line", filename)
+                return self.read_from_lines(filename)
+
+            # Only read the first line to get the number of columns
+            with open(filename) as f:
+                ncols = len(f.readline().split())
+            try:
+                if ncols >= 4:
+                    self.x, self.y, self.field, self.weight = np.loadtxt(filename, usecols=(0, 1, 2, 3),
+                                                                         ndmin=2, unpack=True)
+                else:
+                    # All the columns are read, so that a weight provided only
+                    # on some lines makes the parsing fail instead of being ignored
+                    self.x, self.y, self.field = np.loadtxt(filename, ndmin=2, unpack=True)
+                    self.weight = np.ones_like(self.field)
+            except ValueError:
+                logger.warning("Cannot parse %s at once, reading it line by line", filename)
+                self.read_from_lines(filename)
             return self
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
+    def read_from_lines(self, filename):
+        """Read the information contained in a DIVA data file
+        lon, lat, field, (weight), line by line.
+
+        The reading stops at the first line with less than 3 columns.
+        The weight is set to 1 on the lines where it is not provided.
+
+        If numba is installed, the file is memory-mapped and parsed by a compiled
+        function which fills preallocated arrays; otherwise (or if some values
+        cannot be converted by that function) python lists are used.
+        :param filename: name of the 'data' file
+        :type filename: str
+        """
+
+        if os.path.getsize(filename) > 0 and _load_numba():
+            with open(filename, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    buf = np.frombuffer(mm, dtype=np.uint8)
+                    nmax = np.count_nonzero(buf == 10) + 1
+                    x, y, field, weight = np.empty(nmax), np.empty(nmax), np.empty(nmax), np.empty(nmax)
+                    ndata = _parse_data_buffer(buf, x, y, field, weight)
+                    # Release the buffer before closing the map
+                    del buf
+            if ndata >= 0:
+                self.x = x[:ndata].copy()
+                self.y = y[:ndata].copy()
+                self.field = field[:ndata].copy()
+                self.weight = weight[:ndata].copy()
+                return self
+            logger.debug("Compiled parser failed on %s, using python lists", filename)
+
+        lon, lat, field, weight = [], [], [], []
+        lon_append, lat_append = lon.append, lat.append
+        field_append, weight_append = field.append, weight.append
+
+        with open(filename, 'r') as f:
+            for line in f:
+                parts = line.split()
+                ncols = len(parts)
+                if ncols < 3:
+                    break
+                lon_append(float(parts[0]))
+                lat_append(float(parts[1]))
+                field_append(float(parts[2]))
+                weight_append(float(parts[3]) if ncols >= 4 else 1.)
+
+        self.x = np.array(lon)
+        self.y = np.array(lat)
+        self.field = np.array(field)
+        self.weight = np.array(weight)
+        return self
+
     def add_to_plot(self, m=None, **kwargs):
         """Add the data points to the plot using a scatter plot.
         :param m: basemap projection
@@ -296,7 +646,7 @@ class Diva2DData(object):
         """
         try:
             ndata = len(self.x)
-            logger.info("Number of data points: {0}".format(ndata))
+            logger.info("Number of data points: %s", ndata)
         except AttributeError:
             logger.error("Data object has not been defined")
             ndata = 0
@@ -311,29 +661,39 @@ class Diva2DData(object):
         :type varname: str
         """
 
-        geojsondata = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lon, lat],
-                    },
-                    "properties": {"field": field, "weight": weight},
-                } for lon, lat, field, weight in zip(self.x, self.y, self.field, self.weight)]
-        }
+        # The features are built and written by blocks of data points
+        blocks = (self._geojson_features(start, start + _GEOJSON_BLOCK)
+                  for start in range(0, len(self.x), _GEOJSON_BLOCK))
 
         try:
             with open(os.path.join(filename), 'w') as f:
                 f.write("".join(("var ", varname, " = ")))
-                out = json.dumps(geojsondata, indent=2, separators=(',', ': '))
-                f.write(out)
+                _write_json_blocks(f, {"type": "FeatureCollection"}, "features", blocks)
 
         except FileNotFoundError:
-            logger.error("Directory {} does not exist".format(os.path.basename(filename)))
+            logger.error("Directory %s does not exist", os.path.basename(filename))
             raise FileNotFoundError('Directory does not exist')
 
+    def _geojson_features(self, start, stop):
+        """Build the geoJSON features of the data points between 'start' and 'stop'
+        :param start: index of the first data point
+        :type start: int
+        :param stop: index after the last data point
+        :type stop: int
+        :return: list of dict
+        """
+        # Convert the arrays to lists at once rather than element by element
+        coordinates = np.column_stack((self.x[start:stop], self.y[start:stop])).tolist()
+        return [{
+                "type": "Feature",
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": coords,
+                },
+                "properties": {"field": field, "weight": weight},
+                } for coords, field, weight in zip(coordinates, self.field[start:stop].tolist(),
+                                                   self.weight[start:stop].tolist())]
+
 
 class Diva2DContours(object):
     """
@@ -348,24 +708,17 @@ class Diva2DContours(object):
         :type y: numpy ndarray
         """
         logger.info("Creating Diva 2D contour object")
+        self._closed = None
         if (x is None) | (y is None):
             logger.info("Contour coordinates not defined")
             self.x = x
             self.y = y
         else:
-            if isinstance(x, list):
-                x = np.array(x)
-            elif isinstance(x, np.ndarray):
-                pass
-            else:
+            if not isinstance(x, (list, np.ndarray)):
                 logger.error("Not a valid type for x coordinates")
                 raise Exception("Not a valid type for x coordinates")
 
-            if isinstance(y, list):
-                y = np.array(y)
-            elif isinstance(y, np.ndarray):
-                pass
-            else:
+            if not isinstance(y, (list, np.ndarray)):
                 logger.error("Not a valid type for y coordinates")
                 raise Exception("Not a valid type for y coordinates")
 
@@ -376,13 +729,37 @@ class Diva2DContours(object):
                 logger.error("Input vectors have not the same length")
                 Exception("Input vectors have not the same length")
 
+    @property
+    def x(self):
+        """x-coordinates of the sub-contours, stored as views on a single contiguous array
+        """
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        self._xflat, self._xoffsets = _pack_contours(x)
+        self._x = _unpack_contours(self._xflat, self._xoffsets)
+        self._closed = None
+
+    @property
+    def y(self):
+        """y-coordinates of the sub-contours, stored as views on a single contiguous array
+        """
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        self._yflat, self._yoffsets = _pack_contours(y)
+        self._y = _unpack_contours(self._yflat, self._yoffsets)
+        self._closed = None
+
     @property
     def get_contours_number(self):
         """ Return the number of sub-contours
         :return: ncontour: int
         """
         ncontour = len(self.x)
-        logger.info("Number of contours: {0}".format(ncontour))
+        logger.info("Number of contours: %s", ncontour)
         return ncontour
 
     @property
@@ -390,11 +767,22 @@ class Diva2DContours(object):
         """
         For each contour, return the number of points
         """
-        ncontour = self.get_contours_number
-        npoints = []
-        for i in range(0, ncontour):
-            npoints.append(len(self.x[i]))
-        return npoints
+        return np.diff(self._xoffsets).tolist()
+
+    def get_closed_contours(self):
+        """Return the coordinates of the sub-contours with their first point appended
+        at the end, so that they form closed lines.
+
+        The closed coordinates are computed once, in a single preallocated array,
+        and reused until the contour coordinates are replaced.
+        :return: xclosed: list of numpy ndarrays
+        :return: yclosed: list of numpy ndarrays
+        """
+        if self._closed is None:
+            logger.debug("Closing the sub-contours")
+            self._closed = (_unpack_contours(*_close_contours(self._xflat, self._xoffsets)),
+                            _unpack_contours(*_close_contours(self._yflat, self._yoffsets)))
+        return self._closed
 
     def write_to(self, filename):
         """Write the contour coordinates into the selected file
@@ -405,17 +793,17 @@ class Diva2DContours(object):
         ncontour = self.get_contours_number
         npoints = self.get_points_number
 
-        with open(filename, 'w') as f:
-            f.write(str(ncontour) + '\n')
-            for i in range(0, ncontour):
+        # Build the whole content in memory and write it at once
+        parts = [str(ncontour)]
+        for i in range(0, ncontour):
+            logger.debug("Sub-contour no. %d has %d points", i + 1, npoints[i])
+            parts.append(str(npoints[i]))
+            parts.extend(' '.join((str(xx), str(yy))) for xx, yy in zip(self.x[i], self.y[i]))
 
-                logger.debug("Sub-contour no. {0} has {1} points".format(i + 1, npoints[i]))
-                f.write(str(npoints[i]) + '\n')
-                for xx, yy in zip(self.x[i], self.y[i]):
-                    line = ' '.join((str(xx), str(yy)))
-                    f.write(line + '\n')
+        with open(filename, 'w') as f:
+            f.write('\n'.join(parts) + '\n')
 
-        logger.info("Written contours into file {0}".format(filename))
+        logger.info("Written contours into file %s", filename)
 
     def to_geojson(self, filename, varname='contours'):
         """
@@ -426,112 +814,98 @@ class Diva2DContours(object):
         :type varname: str
         """
 
-        geojsoncontour = {
-            "type": "MultiPolygon",
-            "coordinates": [[[[x, y] for x, y in zip(self.x[cont], self.y[cont])]] for cont in
-                            range(0, self.get_contours_number)]
-        }
+        polygons = ([np.column_stack((lon, lat)).tolist()] for lon, lat in zip(self.x, self.y))
 
         try:
             with open(os.path.join(filename), 'w') as f:
                 f.write("".join(("var ", varname, " = ")))
-                out = json.dumps(geojsoncontour, indent=2, separators=(',', ': '))
-                f.write(out)
+                _write_json_stream(f, {"type": "MultiPolygon"}, "coordinates", polygons)
         except FileNotFoundError:
-            logger.error("Directory {} does not exist".format(os.path.basename(filename)))
+            logger.error("Directory %s does not exist", os.path.basename(filename))
             raise FileNotFoundError('Directory does not exist')
 
     def read_from_np(self, filename):
         """Get the coordinates of the contour from an already existing contour file.
 
-        The function use numpy method 'genfromtxt' several times and is not optimised at all.
-        For large contour files, prefer 'read_from' function.
+        The whole file is converted to a flat ndarray in a single pass with numpy
+        'fromstring'. Once the headers are removed, the coordinates are stored in
+        contiguous arrays and each sub-contour is a view on these arrays.
         :parameter: filename: str
-        :return: lon: numpy ndarray
-        :return: lat: numpy ndarray
+        :return: lon: list of numpy ndarrays
+        :return: lat: list of numpy ndarrays
         """
 
         # Check if the file exist
         if os.path.exists(filename):
 
-            # Count number of contour and lines in the files
-            # %timeit shows that "linecache" is way faster than "readline" on the first line
-            logger.info("Reading contours from file {0}".format(filename))
-            ncontours = int(linecache.getline(filename, 1))
-
+            logger.info("Reading contours from file %s", filename)
             with open(filename) as f:
-                nlines = sum(1 for _ in f)
-
-            logger.debug("Number of contours: {0}".format(ncontours))
-
-            # Initialise lon and lat as list of lists
-            lon = [[]] * ncontours
-            lat = [[]] * ncontours
+                values = np.fromstring(f.read(), sep=' ')
 
-            # Initialise line to read number
-            linenum = 2
+            ncontours = int(values[0])
+            logger.debug("Number of contours: %s", ncontours)
 
-            # Loop on the contours
+            # Position of the headers (number of points of each sub-contour)
+            headers = np.empty(ncontours, dtype=np.int64)
+            pos = 1
             for n in range(0, ncontours):
-                # Number of points in the current contour
-                npoints = int(linecache.getline(filename, linenum))
-                nskiplines = linenum + npoints
-
-                # Load coordinates (npoints lines to be read)
-                coords = np.genfromtxt(filename, skip_header=linenum, skip_footer=nlines - nskiplines)
-                coords = coords.T
-                lon[n] = coords[0]
-                lat[n] = coords[1]
-
-                # Update line number
-                # (taking into account the number of points already read)
-                linenum = nskiplines + 1
-
-            self.x = np.array(lon)
-            self.y = np.array(lat)
+                headers[n] = pos
+                pos += 1 + 2 * int(values[pos])
+            npoints = values[headers].astype(np.int64)
+            offsets = np.concatenate(([0], np.cumsum(npoints)))
+
+            # Remove the headers to get all the coordinates in a contiguous array
+            keep = np.ones(pos, dtype=bool)
+            keep[0] = False
+            keep[headers] = False
+            coords = values[:pos][keep].reshape(-1, 2)
+
+            self._xflat, self._xoffsets = np.ascontiguousarray(coords[:, 0]), offsets
+            self._yflat, self._yoffsets = np.ascontiguousarray(coords[:, 1]), offsets
+            self._x = _unpack_contours(self._xflat, offsets)
+            self._y = _unpack_contours(self._yflat, offsets)
+            self._closed = None
 
             return self
 
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
     def read_from(self, filename):
         """Get the coordinates of the contour from an already existing contour file.
 
-        The function reads the file only once and performs the conversion from lists
-        to ndarrays at the end of the loop.
+        The function reads the file only once and converts the coordinates of each
+        sub-contour to ndarrays in a single operation.
         :parameter filename: name of the 'contour' file
         :type filename: str
-        :return: lon: numpy ndarray
-        :return: lat: numpy ndarray
+        :return: lon: list of numpy ndarrays
+        :return: lat: list of numpy ndarrays
         """
 
         if os.path.exists(filename):
-            logger.info("Reading contours from file {0}".format(filename))
+            logger.info("Reading contours from file %s", filename)
             with open(filename, 'r') as f:
-                ncontour = int(f.readline().split()[0])
-                logger.debug("Number of contours: {0}".format(ncontour))
-                numpoints = []
-                lon, lat = [], []
-                for nc in range(0, ncontour):
-                    npoints = int(f.readline().split()[0])
-                    numpoints.append(npoints)
-                    xx, yy = [], []
-                    for pp in range(0, npoints):
-                        # Read the coordinates of the sub-contour
-                        coords = f.readline()
-                        xx.append(float(coords.split()[0]))
-                        yy.append(float(coords.split()[1]))
-                    lon.append(xx)
-                    lat.append(yy)
-            self.x = np.array(lon)
-            self.y = np.array(lat)
+                data = f.read().split()
+            ncontour = int(data[0])
+            logger.debug("Number of contours: %s", ncontour)
+            lon, lat = [], []
+            pos = 1
+            for nc in range(0, ncontour):
+                npoints = int(data[pos])
+                pos += 1
+                # Convert the coordinates of the sub-contour at once
+                coords = np.array(data[pos:pos + 2 * npoints], dtype=np.float64).reshape(npoints, 2)
+                pos += 2 * npoints
+                lon.append(coords[:, 0])
+                lat.append(coords[:, 1])
+            self.x = lon
+            self.y = lat
 
             return self
 
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
     def add_to_plot(self, m=None, **kwargs):
@@ -540,21 +914,18 @@ class Diva2DContours(object):
         :type m: mpl_toolkits.basemap.Basemap
         """
 
+        xclosed, yclosed = self.get_closed_contours()
+
         if m is None:
             logger.debug("No projection defined")
             logger.debug('Adding contours to plot')
-            for lon, lat in zip(self.x, self.y):
-                # Append first element of the array to close the contour
-                plt.plot(np.append(lon, lon[0]),
-                         np.append(lat, lat[0]),
-                         **kwargs)
+            for lon, lat in zip(xclosed, yclosed):
+                plt.plot(lon, lat, **kwargs)
         else:
             logger.debug("Applying projection to coordinates")
             logger.debug('Adding contours to map')
-            for lon, lat in zip(self.x, self.y):
-                m.plot(np.append(lon, lon[0]),
-                       np.append(lat, lat[0]),
-                       latlon=True, **kwargs)
+            for lon, lat in zip(xclosed, yclosed):
+                m.plot(lon, lat, latlon=True, **kwargs)
 
 
 class Diva2DParameters(object):
@@ -674,26 +1045,19 @@ class Diva2DParameters(object):
         :type filename: str
         :return
         """
-        paramstring = ("# Correlation Length lc \n{0} \n"
-                       "# icoordchange \n{1} \n"
-                       "# ispec \n{2} \n"
-                       "# ireg \n{3} \n"
-                       "# xori \n{4} \n"
-                       "# yori \n{5} \n"
-                       "# dx \n{6} \n"
-                       "# dy \n{7} \n"
-                       "# nx \n{8} \n"
-                       "# ny \n{9} \n"
-                       "# valex \n{10} \n"
-                       "# snr \n{11} \n"
-                       "# varbak \n{12}").format(self.cl, self.icoordchange, self.ispec,
-                                                 self.ireg, self.xori, self.yori, self.dx, self.dy,
-                                                 self.nx, self.ny, self.valex, self.snr, self.varbak,
-                                                 )
+        params = (("Correlation Length lc", self.cl), ("icoordchange", self.icoordchange),
+                  ("ispec", self.ispec), ("ireg", self.ireg), ("xori", self.xori), ("yori", self.yori),
+                  ("dx", self.dx), ("dy", self.dy), ("nx", self.nx), ("ny", self.ny),
+                  ("valex", self.valex), ("snr", self.snr), ("varbak", self.varbak))
+        lines = []
+        for name, value in params:
+            lines.append("# {0} ".format(name))
+            lines.append("{0} ".format(value))
+        paramstring = "\n".join(lines) + "\n"
 
         with open(filename, 'w') as f:
             f.write(paramstring)
-            logger.info("Written parameters into file {0}".format(filename))
+            logger.info("Written parameters into file %s", filename)
 
     def read_from(self, filename):
         """Read the information contained in a DIVA parameter file
@@ -702,7 +1066,7 @@ class Diva2DParameters(object):
         :type filename: str
         """
         if os.path.exists(filename):
-            logger.info("Reading parameters from file {0}".format(filename))
+            logger.info("Reading parameters from file %s", filename)
             cl, icoord, ispec, ireg, xori, yori, dx, dy, nx,\
                 ny, valex, snr, varbak = np.loadtxt(filename, comments='#', unpack=True)
 
@@ -726,7 +1090,7 @@ class Diva2DParameters(object):
 
             return self
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
     def plot_outputgrid(self, scalefactor=1, **kwargs):
@@ -743,8 +1107,15 @@ class Diva2DParameters(object):
 
         xx = np.arange(self.xori, self.xend, scalefactor * self.dx)
         yy = np.arange(self.yori, self.yend, scalefactor * self.dy)
-        plt.hlines(yy, self.xori, self.xend, linewidth=0.2, **kwargs)
-        plt.vlines(xx, self.yori, self.yend, linewidth=0.2, **kwargs)
+
+        # All the grid lines are added as a single collection
+        hsegs = np.stack((np.column_stack((np.full_like(yy, self.xori), yy)),
+                          np.column_stack((np.full_like(yy, self.xend), yy))), axis=1)
+        vsegs = np.stack((np.column_stack((xx, np.full_like(xx, self.yori))),
+                          np.column_stack((xx, np.full_like(xx, self.yend)))), axis=1)
+        ax = plt.gca()
+        ax.add_collection(LineCollection(np.concatenate((hsegs, vsegs)), linewidths=0.2, **kwargs))
+        ax.autoscale_view()
 
         logger.debug('Adding output grid to plot')
 
@@ -775,10 +1146,8 @@ class Diva2DValatxy(object):
         :type filename: str
         :return:
         """
-        with open(filename, 'w') as f:
-            for xx, yy in zip(self.x, self.y):
-                f.write("%s %s\n" % (xx, yy))
-        logger.info("Written locations into file {0}".format(filename))
+        np.savetxt(filename, np.column_stack((self.x, self.y)), fmt="%.17g")
+        logger.info("Written locations into file %s", filename)
 
     def read_from(self, filename):
         """Read the information contained in a valatxy file
@@ -805,6 +1174,110 @@ class Diva2DValatxy(object):
         return dataplot
 
 
+def _is_linspace(values):
+    """Check if the values are regularly spaced.
+    The tolerance on the steps accounts for the precision of the values
+    (e.g. the float32 coordinates written by Diva).
+    :param values: coordinates
+    :type values: numpy ndarray
+    :return: bool
+    """
+    if len(values) < 2:
+        return False
+    eps = np.finfo(np.result_type(values.dtype, np.float32)).eps
+    values = np.asarray(values, dtype=np.float64)
+    step = (values[-1] - values[0]) / (len(values) - 1)
+    tolerance = 4. * eps * np.abs(values).max()
+    return step != 0 and bool(np.abs(np.diff(values) - step).max() <= tolerance)
+
+
+# Keyword arguments of 'pcolormesh' that 'imshow' also accepts
+_IMSHOW_KWARGS = {'cmap', 'norm', 'vmin', 'vmax', 'alpha', 'zorder', 'label'}
+
+
+def _copy_input(source, target):
+    """Copy a file to the Diva input directory, unless the target already is
+    the same file (same path, or another path to the same file).
+    :param source: path to the file provided by the user
+    :type source: str
+    :param target: path to the file in the Diva input directory
+    :type target: str
+    """
+    if os.path.exists(target) and os.path.samefile(source, target):
+        logger.debug("File %s already in place", source)
+    else:
+        shutil.copy2(source, target)
+
+
+def _readonly(values):
+    """Return a C-contiguous, read-only version of the array read from a netCDF file.
+    Masked arrays stay masked.
+    :param values: array read from a netCDF variable
+    :type values: numpy ndarray or numpy masked array
+    :return: numpy ndarray or numpy masked array
+    """
+    if np.ma.isMaskedArray(values):
+        values = np.ma.array(values, copy=False, order='C')
+    else:
+        values = np.ascontiguousarray(values)
+    values.flags.writeable = False
+    return values
+
+
+# Maximal number of result files kept in the cache of 'Diva2DResults.read_from'
+_RESULT_CACHE_SIZE = 8
+
+# Last content read from the most recently used result files, oldest first:
+# {path: ((mtime_ns, size), (x, y, analysis, error))}
+_result_cache = collections.OrderedDict()
+
+
+def _read_result_cached(filename):
+    """Read the coordinates, the analysed and the error fields from a netCDF result file.
+    Only the last read of each file is kept in the cache, and it is replaced as soon
+    as the modification time or the size of the file changes (e.g. when 'divacalc'
+    rewrites it). At most _RESULT_CACHE_SIZE files are kept, the least recently
+    used ones are dropped first. The cached arrays are read-only.
+    :param filename: name of the 'result' file
+    :type filename: str
+    :return: tuple with x, y, analysis and error (None if not in the file)
+    """
+    key = os.path.abspath(filename)
+    stat = os.stat(filename)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _result_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        _result_cache.move_to_end(key)
+        return cached[1]
+
+    # Drop the outdated content before reading the new one
+    _result_cache.pop(key, None)
+    with _nc().Dataset(filename) as nc:
+        x = _readonly(nc.variables['x'][:])
+        y = _readonly(nc.variables['y'][:])
+        analysis = _readonly(nc.variables['analyzed_field'][:])
+        if 'error_field' in nc.variables:
+            error = _readonly(nc.variables['error_field'][:])
+        else:
+            error = None
+    _result_cache[key] = (stamp, (x, y, analysis, error))
+    while len(_result_cache) > _RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+    return x, y, analysis, error
+
+
+def clear_result_cache(filename=None):
+    """Remove a result file (or all the files) from the cache used by
+    'Diva2DResults.read_from'.
+    :param filename: name of the 'result' file; if None, the whole cache is cleared
+    :type filename: str
+    """
+    if filename is None:
+        _result_cache.clear()
+    else:
+        _result_cache.pop(os.path.abspath(filename), None)
+
+
 class Diva2DResults(object):
     """Class that stores the results of the analysis
     """
@@ -812,78 +1285,82 @@ class Diva2DResults(object):
     def __init__(self, x=None, y=None, analysis=None, error=None):
         """Creation of the Diva 2D 'Result' object using the user inputs.
         :param x: x-coordinates
-        :type x: numpy array
+        :type x: numpy array or list
         :param y: y-coordinates
-        :type y: numpy array
+        :type y: numpy array or list
         :param analysis: analysed field (2D)
         :type analysis: numpy ndarray
         :param error: error field (2D)
         :type error: numpy ndarray
+        :raises ValueError: if the shapes of the fields are not (len(y), len(x))
         """
         logger.info("Creating Diva 2D Result object")
-        if isinstance(x, np.ndarray):
-            self.x = x
-        elif isinstance(x, list):
-            self.x = np.array(x)
+        # File the result was read from (see 'read_from')
+        self._resultfile = None
+        # No copy for the inputs that already are arrays (masked fields stay masked)
+        self.x = None if x is None else np.asarray(x)
+        self.y = None if y is None else np.asarray(y)
+        self.analysis = None if analysis is None else np.asanyarray(analysis)
+        self.error = None if error is None or analysis is None else np.asanyarray(error)
+
+        if self.analysis is None:
+            logger.debug("Analysed field not defined")
         else:
-            logger.debug("X vector not defined. Should be np.ndarray or list")
-            self.x = None
+            shape = None if self.x is None or self.y is None else (self.y.size, self.x.size)
+            if self.analysis.shape != shape or (self.error is not None and self.error.shape != shape):
+                logger.error("Dimension mismatch")
+                raise ValueError("Dimension mismatch")
 
-        if isinstance(y, np.ndarray):
-            self.y = y
-        elif isinstance(x, list):
-            self.y = np.array(y)
-        else:
-            logger.debug("Y vector not defined. Should be np.ndarray or list")
-            self.y = None
+    def clear(self):
+        """Release the coordinates and the fields of the result, for instance before
+        running a new analysis with the same object.
 
-        if isinstance(analysis, np.ndarray):
-            if analysis.shape[0] == len(x) and analysis.shape[1] == len(y):
-                logger.debug('Consistent dimensions for the analysed field')
-                self.analysis = analysis
-                if isinstance(error, np.ndarray):
-                    if analysis.shape == error.shape:
-                        logger.debug('Consistent dimensions for the error field')
-                        self.error = error
-                    else:
-                        logger.error("Dimension mismatch")
-                        raise Exception("Dimension mismatch")
-                else:
-                    logger.debug("Error field not defined")
-                    self.error = None
-            else:
-                logger.error("Dimension mismatch")
-                raise Exception("Dimension mismatch")
-        else:
-            logger.debug("Analysed field not defined")
-            self.analysis = None
-            self.error = None
+        Example:
+        =======
+
+            Results.clear()
+            Results.make(divadir, datafile=datafile)
+
+        If the result was read from a file, the content of that file is also
+        removed from the cache of 'read_from'.
+        :return: the cleared object
+        """
+        self.x = None
+        self.y = None
+        self.analysis = None
+        self.error = None
+        if self._resultfile is not None:
+            clear_result_cache(self._resultfile)
+            self._resultfile = None
+        return self
 
     def read_from(self, filename):
         """Read the analyzed field, the error field (if exists) and their coordinates
         from the netCDF file.
-        If the error field doesn't exist, the function return a field full of NaN's.
+        If the error field doesn't exist, 'error' is set to None (no array is allocated),
+        so the users of 'error' have to check it first.
+        The content of the file is cached until the file is modified, so reading
+        the same file again doesn't decode the netCDF again and gives the same arrays.
+        These arrays are shared with the cache (and the other objects that read the
+        file), so they are read-only: copy them (e.g. 'Results.analysis.copy()')
+        before modifying them in place.
+        Use 'clear_result_cache' to release the cached arrays.
         :param filename: name of the 'result' file
         :type filename: str
         """
 
         try:
-            with netCDF4.Dataset(filename) as nc:
-                self.x = nc.variables['x'][:]
-                self.y = nc.variables['y'][:]
-                self.analysis = nc.variables['analyzed_field'][:]
-                try:
-                    self.error = nc.variables['error_field'][:]
-                except KeyError:
-                    logger.info("No error field in the netCDF file (will return NaN's)")
-                    self.error = np.nan * self.analysis
-
-            return self
-
+            self.x, self.y, self.analysis, self.error = _read_result_cached(filename)
+            self._resultfile = filename
         except OSError:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
+        if self.error is None:
+            logger.info("No error field in the netCDF file (error set to None)")
+
+        return self
+
     def to_geojson(self, filename, varname='results', levels=None):
         """
         Write the analysed field or the error to a geoJSON file
@@ -893,36 +1370,41 @@ class Diva2DResults(object):
         :type varname: str
         :param levels: list of levels to be contour-ed
         :type levels: list or np.array
+
+        If the analysed field is constant or has no finite value, an empty
+        FeatureCollection is written.
         """
 
-        llon, llat = np.meshgrid(self.x, self.y)
-        contoursfield = cntr.Cntr(llon, llat, self.analysis)
-        if levels is None:
-            # By default we represent 10 levels from min to max
-            levels = np.linspace(self.analysis.min(), self.analysis.max(), 10)
-
-        geojsonfield = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "MultiPolygon",
-                        "coordinates": [[[[lon, lat] for lon, lat in seg] for seg in
-                                         contoursfield.trace(level)[:len(contoursfield.trace(level)) // 2]]],
-                    },
-                    "properties": {"field": str(level)},
-                } for level in levels]
-        }
+        finitefield = np.ma.masked_invalid(self.analysis, copy=False)
+        if finitefield.count() == 0 or finitefield.min() == finitefield.max():
+            # No contour to trace in a constant or undefined field
+            logger.info("Constant or undefined analysed field: no contour written")
+            features = ()
+        else:
+            # contourpy accepts the 1-D coordinates of the regular grid directly
+            contoursfield = _contour_generator(self.x, self.y, self.analysis)
+            if levels is None:
+                # By default we represent 10 levels from min to max,
+                # without the extreme levels that give no contours
+                levels = np.linspace(finitefield.min(), finitefield.max(), 10)[1:-1]
+
+            # The contours of each level are traced only when the feature is written
+            features = ({
+                        "type": "Feature",
+                        "geometry": {
+                            "type": "MultiPolygon",
+                            "coordinates": [contoursfield.lines(level)],
+                        },
+                        "properties": {"field": str(level)},
+                        } for level in levels)
 
         try:
             with open(os.path.join(filename), 'w') as f:
                 f.write("".join(("var ", varname, " = ")))
-                out = json.dumps(geojsonfield, indent=2, separators=(',', ': '))
-                f.write(out)
+                _write_json_stream(f, {"type": "FeatureCollection"}, "features", features)
 
         except FileNotFoundError:
-            logger.error("Directory {} does not exist".format(os.path.basename(filename)))
+            logger.error("Directory %s does not exist", os.path.basename(filename))
             raise FileNotFoundError('Directory does not exist')
 
     def add_to_plot(self, field='analysis', m=None, **kwargs):
@@ -931,19 +1413,26 @@ class Diva2DResults(object):
         :type field: str
         :param m: basemap projection
         :type m: mpl_toolkits.basemap.Basemap
-        :return resultplot: matplotlib.collections.QuadMesh
-        :type resultplot: QuadMesh
+        :return resultplot: matplotlib.image.AxesImage if the coordinates are regularly
+        spaced, no projection is used and the keyword arguments are only among
+        cmap, norm, vmin, vmax, alpha, zorder and label;
+        matplotlib.collections.QuadMesh otherwise
+        :type resultplot: AxesImage or QuadMesh
         """
 
+        if field == 'error' and self.error is None:
+            logger.warning("No error field to plot")
+            return None
+
         if m is None:
             logger.debug("No projection defined")
             if field == 'analysis':
                 logger.debug('Adding analysed field to plot')
-                resultplot = plt.pcolormesh(self.x, self.y, self.analysis, **kwargs)
+                resultplot = self._plot_field(self.analysis, **kwargs)
                 # plt.colorbar()
             elif field == 'error':
                 logger.debug('Adding error field to plot')
-                resultplot = plt.pcolormesh(self.x, self.y, self.error, **kwargs)
+                resultplot = self._plot_field(self.error, **kwargs)
                 # plt.colorbar()
             else:
                 logger.error("Field selected for plot does not exist")
@@ -972,6 +1461,28 @@ class Diva2DResults(object):
 
         return resultplot
 
+    def _plot_field(self, fielddata, **kwargs):
+        """Plot a field without projection: as an image if the grid is regular
+        (much cheaper than a mesh) with increasing coordinates, the field has the
+        (ny, nx) shape and only the options shared by 'imshow' and 'pcolormesh' are
+        passed, with 'pcolormesh' otherwise (which also checks the dimensions)
+        :param fielddata: field to be plotted
+        :type fielddata: numpy ndarray
+        :return: matplotlib.image.AxesImage or matplotlib.collections.QuadMesh
+        """
+        asimage = (_IMSHOW_KWARGS.issuperset(kwargs)
+                   and np.shape(fielddata) == (len(self.y), len(self.x))
+                   and _is_linspace(self.x) and _is_linspace(self.y)
+                   and self.x[-1] > self.x[0] and self.y[-1] > self.y[0])
+        if asimage:
+            # Cells are centered on the coordinates
+            dx = 0.5 * (self.x[1] - self.x[0])
+            dy = 0.5 * (self.y[1] - self.y[0])
+            return plt.imshow(fielddata, extent=(self.x[0] - dx, self.x[-1] + dx,
+                                                 self.y[0] - dy, self.y[-1] + dy),
+                              origin='lower', aspect='auto', interpolation='nearest', **kwargs)
+        return plt.pcolormesh(self.x, self.y, fielddata, **kwargs)
+
     def make(self, divadir, datafile=None, paramfile=None, contourfile=None, outputfile=None):
         """Perform the interpolation using script divacalc
         :param divadir: main Diva directory
@@ -995,9 +1506,9 @@ class Diva2DResults(object):
                 return
         else:
             try:
-                shutil.copy2(datafile, divafiles.data)
+                _copy_input(datafile, divafiles.data)
             except FileNotFoundError:
-                logger.error("File {0} doesn't exist".format(datafile))
+                logger.error("File %s doesn't exist", datafile)
                 logger.error("Execution stopped")
                 return
 
@@ -1006,25 +1517,23 @@ class Diva2DResults(object):
                 logger.error("No param.par file in ./input")
                 return
         else:
-            if paramfile != divafiles.parameter:
-                try:
-                    shutil.copy2(paramfile, divafiles.parameter)
-                except FileNotFoundError:
-                    logger.error("File {0} doesn't exist".format(paramfile))
-                    logger.error("Execution stopped")
-                    return
+            try:
+                _copy_input(paramfile, divafiles.parameter)
+            except FileNotFoundError:
+                logger.error("File %s doesn't exist", paramfile)
+                logger.error("Execution stopped")
+                return
 
         if contourfile is None:
             if not os.path.exists(divafiles.contour):
                 logger.error("No coast.cont file in ./input")
         else:
-            if contourfile != divafiles.contour:
-                try:
-                    shutil.copy2(contourfile, divafiles.contour)
-                except FileNotFoundError:
-                    logger.error("File {0} doesn't exist".format(contourfile))
-                    logger.error("Execution stopped")
-                    return
+            try:
+                _copy_input(contourfile, divafiles.contour)
+            except FileNotFoundError:
+                logger.error("File %s doesn't exist", contourfile)
+                logger.error("Execution stopped")
+                return
 
         # Check for mesh
         if os.path.exists(divafiles.mesh) and os.path.exists(divafiles.meshtopo):
@@ -1035,13 +1544,12 @@ class Diva2DResults(object):
                               paramfile=divafiles.parameter)
 
 
-        calcprocess = subprocess.run("./divacalc", cwd=divadirs.diva2d,
-                                       stdout=subprocess.PIPE, shell=True)
-        out = calcprocess.stdout
-
-        if logfile:
-            with open(logfile, 'a') as f:
-                f.write(str(out).replace('\\n', '\n'))
+        # Stream the output of the executable directly to the log file
+        logger.debug("Running divacalc")
+        os.makedirs(logdir, exist_ok=True)
+        with open(logfile, 'ab') as lf:
+            subprocess.run(["./divacalc"], cwd=divadirs.diva2d,
+                           stdout=lf, stderr=subprocess.STDOUT)
 
         # Check if analysis has been performed
         if os.path.exists(os.path.join(divadirs.diva2d, 'divawork/fort.84')):
@@ -1050,13 +1558,57 @@ class Diva2DResults(object):
             self.read_from(divafiles.result)
             # Copy results to another file if define
             if outputfile is not None:
-                logger.debug("Copy result file to {0}".format(outputfile))
+                logger.debug("Copy result file to %s", outputfile)
                 shutil.copy2(divafiles.result, outputfile)
             return self
         else:
             logger.error("Analysis not performed, check log for more details")
 
 
+def _index_dtype(nnodes):
+    """Return the smallest integer type able to index the nodes of a mesh:
+    int32 for all the usual meshes, int64 beyond 2**31 nodes.
+    :param nnodes: number of nodes
+    :type nnodes: int
+    :return: numpy dtype
+    """
+    return np.int32 if nnodes < 2 ** 31 else np.int64
+
+
+def _centroids(xnode, ynode, i1, i2, i3):
+    """Compute the centroids of the triangles of a mesh.
+    :param xnode: x-coordinates of the nodes
+    :type xnode: numpy ndarray
+    :param ynode: y-coordinates of the nodes
+    :type ynode: numpy ndarray
+    :param i1: indices of the first nodes of the triangles
+    :type i1: numpy ndarray
+    :param i2: indices of the second nodes of the triangles
+    :type i2: numpy ndarray
+    :param i3: indices of the third nodes of the triangles
+    :type i3: numpy ndarray
+    :return: x- and y-coordinates of the centroids
+    :rtype: tuple of numpy ndarray
+    """
+    xc = (1. / 3.) * (xnode[i1] + xnode[i2] + xnode[i3])
+    yc = (1. / 3.) * (ynode[i1] + ynode[i2] + ynode[i3])
+    return xc, yc
+
+
+def _centroids_loop(xnode, ynode, i1, i2, i3):
+    """Same computation as '_centroids', without the temporary arrays.
+    Compiled by numba (see '_load_numba'), the loop is distributed over the
+    available cores.
+    """
+    n = i1.shape[0]
+    xc = np.empty(n)
+    yc = np.empty(n)
+    for j in _prange(n):
+        xc[j] = (1. / 3.) * (xnode[i1[j]] + xnode[i2[j]] + xnode[i3[j]])
+        yc[j] = (1. / 3.) * (ynode[i1[j]] + ynode[i2[j]] + ynode[i3[j]])
+    return xc, yc
+
+
 class Diva2DMesh(object):
     """This class stores the finite-element mesh generated by Diva.
 
@@ -1100,11 +1652,12 @@ class Diva2DMesh(object):
         self.nnodes = nnodes
         self.ninterfaces = ninterfaces
         self.nelements = nelements
-        self.xnode = xnode
-        self.ynode = ynode
-        self.i1 = i1
-        self.i2 = i2
-        self.i3 = i3
+        # Lists are converted once, as all the methods use array indexing
+        self.xnode = None if xnode is None else np.asarray(xnode, dtype=np.float64)
+        self.ynode = None if ynode is None else np.asarray(ynode, dtype=np.float64)
+        self.i1 = None if i1 is None else np.asarray(i1)
+        self.i2 = None if i2 is None else np.asarray(i2)
+        self.i3 = None if i3 is None else np.asarray(i3)
 
     def read_from_np(self, filename1, filename2):
         """Initialise the mesh object by reading the coordinates and the topology
@@ -1115,50 +1668,45 @@ class Diva2DMesh(object):
 
             Mesh.read_from_np(meshfile, meshtopofile)
 
-        This function uses numpy 'loadtxt' and 'genfromtxt' methods.
+        This function uses numpy 'loadtxt' method, reading only the required columns.
         :param filename1: name of the 'mesh' file (coordinates)
         :type filename1: str
         :param filename2: name of the 'meshtopo' file (topology)
         :type filename2: str
         """
         if os.path.exists(filename1) and os.path.exists(filename2):
-            logger.info("Reading mesh from files {0} and {1}".format(filename1, filename2))
+            logger.info("Reading mesh from files %s and %s", filename1, filename2)
 
             datamesh = np.loadtxt(filename2)
             self.nnodes = int(datamesh[0])
             self.ninterfaces = int(datamesh[1])
             self.nelements = int(datamesh[2])
 
-            # Load mesh nodes
-            meshnodes = np.genfromtxt(filename1, skip_footer=self.nelements + self.ninterfaces)
-            meshnodes = meshnodes.flatten()
-
-            # Load mesh elements
-            meshelements = np.genfromtxt(filename1, skip_header=self.nnodes + self.ninterfaces)
-            meshelements = np.fromstring(meshelements)
-            meshelements = np.int_(meshelements)
-
-            # Extract node coordinates
-            self.xnode = meshnodes[np.arange(1, self.nnodes * 3, 3)]
-            self.ynode = meshnodes[np.arange(2, self.nnodes * 3, 3)]
+            # Load the node coordinates (the columns are selected while parsing)
+            meshnodes = np.loadtxt(filename1, usecols=(1, 2), max_rows=self.nnodes, ndmin=2)
+            self.xnode = meshnodes[:, 0]
+            self.ynode = meshnodes[:, 1]
 
-            # Indices of the elements
-            self.i1 = meshelements[np.arange(0, self.nelements * 6, 6)] - 1
-            self.i2 = meshelements[np.arange(2, self.nelements * 6, 6)] - 1
-            self.i3 = meshelements[np.arange(4, self.nelements * 6, 6)] - 1
+            # Load the indices of the elements
+            meshelements = np.loadtxt(filename1, skiprows=self.nnodes + self.ninterfaces,
+                                      usecols=(0, 2, 4), max_rows=self.nelements,
+                                      dtype=_index_dtype(self.nnodes), ndmin=2)
+            self.i1 = meshelements[:, 0] - 1
+            self.i2 = meshelements[:, 1] - 1
+            self.i3 = meshelements[:, 2] - 1
 
             return self
 
         elif os.path.exists(filename1):
-            logger.error("Mesh topography file {0} does not exist".format(filename2))
+            logger.error("Mesh topography file %s does not exist", filename2)
             raise FileNotFoundError('File does not exist')
 
         elif os.path.exists(filename2):
-            logger.error("Mesh file {0} does not exist".format(filename1))
+            logger.error("Mesh file %s does not exist", filename1)
             raise FileNotFoundError('File does not exist')
 
         else:
-            logger.error("Mesh files {0} and {1} don't exist".format(filename1, filename2))
+            logger.error("Mesh files %s and %s don't exist", filename1, filename2)
             raise FileNotFoundError('File does not exist')
 
     def read_from(self, filename1, filename2):
@@ -1170,8 +1718,8 @@ class Diva2DMesh(object):
 
             Mesh.read_from(meshfile, meshtopofile)
 
-        This function reads the files line by line using 'readline' methods
-        and then convert the lists to numpy array.
+        This function reads all the lines of the files at once and converts
+        the node and element blocks to numpy arrays with 'numpy.fromstring'.
         :param filename1: name of the 'mesh' file (coordinates)
         :type filename1: str
         :param filename2: name of the 'meshtopo' file (topology)
@@ -1179,58 +1727,41 @@ class Diva2DMesh(object):
         """
 
         if os.path.exists(filename1) and os.path.exists(filename2):
-            logger.info("Reading mesh from files {0} and {1}".format(filename1, filename2))
+            logger.info("Reading mesh from files %s and %s", filename1, filename2)
             # Read mesh topology
             with open(filename2) as f:
                 self.nnodes = int(f.readline().rstrip())
                 self.ninterfaces = int(f.readline().rstrip())
                 self.nelements = int(f.readline().rstrip())
 
-            # Initialise line index
-            nlines = 0
-            # and lists
-            xnode = []
-            ynode = []
-            interfaces = []
-            i1, i2, i3 = [], [], []
-
             with open(filename1, 'r') as f:
-                # Read the node coordinates
-                while nlines < self.nnodes:
-                    llines = f.readline().rsplit()
-                    xnode.append(float(llines[1]))
-                    ynode.append(float(llines[2]))
-                    nlines += 1
-                # Read the interfaces
-                while nlines < self.nnodes + self.ninterfaces:
-                    interfaces.append(int(f.readline().rsplit()[0]))
-                    nlines += 1
-                # Read the elements
-                while nlines < self.nnodes + self.ninterfaces + self.nelements:
-                    llines = f.readline().rsplit()
-                    i1.append(int(llines[0]) - 1)
-                    i2.append(int(llines[2]) - 1)
-                    i3.append(int(llines[4]) - 1)
-                    nlines += 1
-
-            self.xnode = np.array(xnode)
-            self.ynode = np.array(ynode)
-            self.i1 = np.array(i1)
-            self.i2 = np.array(i2)
-            self.i3 = np.array(i3)
+                lines = f.readlines()
+
+            # Convert the node coordinates at once
+            nodes = np.fromstring(''.join(lines[:self.nnodes]), sep=' ').reshape(self.nnodes, -1)
+            self.xnode = nodes[:, 1]
+            self.ynode = nodes[:, 2]
+
+            # Skip the interfaces and convert the elements at once
+            elemstart = self.nnodes + self.ninterfaces
+            elements = np.fromstring(''.join(lines[elemstart:elemstart + self.nelements]),
+                                     sep=' ').reshape(self.nelements, -1).astype(_index_dtype(self.nnodes))
+            self.i1 = elements[:, 0] - 1
+            self.i2 = elements[:, 2] - 1
+            self.i3 = elements[:, 4] - 1
 
             return self
 
         elif os.path.exists(filename1):
-            logger.error("Mesh topography file {0} does not exist".format(filename2))
+            logger.error("Mesh topography file %s does not exist", filename2)
             raise FileNotFoundError('File does not exist')
 
         elif os.path.exists(filename2):
-            logger.error("Mesh file {0} does not exist".format(filename1))
+            logger.error("Mesh file %s does not exist", filename1)
             raise FileNotFoundError('File does not exist')
 
         else:
-            logger.error("Mesh files {0} and {1} don't exist".format(filename1, filename2))
+            logger.error("Mesh files %s and %s don't exist", filename1, filename2)
             raise FileNotFoundError('File does not exist')
 
     def make(self, divadir, contourfile=None, paramfile=None):
@@ -1252,33 +1783,30 @@ class Diva2DMesh(object):
                 logger.error("No param.par file in ./input")
                 return
         else:
-            if paramfile != divafiles.parameter:
-                try:
-                    shutil.copy2(paramfile, divafiles.parameter)
-                except FileNotFoundError:
-                    logger.error("File {0} doesn't exist".format(paramfile))
-                    logger.error("Execution stopped")
-                    return
+            try:
+                _copy_input(paramfile, divafiles.parameter)
+            except FileNotFoundError:
+                logger.error("File %s doesn't exist", paramfile)
+                logger.error("Execution stopped")
+                return
 
         if contourfile is None:
             if not os.path.exists(divafiles.contour):
                 logger.error("No coast.cont file in ./input")
         else:
-            if contourfile != divafiles.contour:
-                try:
-                    shutil.copy2(contourfile, divafiles.contour)
-                except FileNotFoundError:
-                    logger.error("File {0} doesn't exist".format(contourfile))
-                    logger.error("Execution stopped")
-                    return
-
-        meshprocess = subprocess.run("./divamesh", cwd=divadirs.diva2d,
-                                     stdout=subprocess.PIPE, shell=True)
-        out = meshprocess.stdout
-
-        if logfile:
-            with open(logfile, 'a') as f:
-                f.write(str(out).replace('\\n', '\n'))
+            try:
+                _copy_input(contourfile, divafiles.contour)
+            except FileNotFoundError:
+                logger.error("File %s doesn't exist", contourfile)
+                logger.error("Execution stopped")
+                return
+
+        # Stream the output of the executable directly to the log file
+        logger.debug("Running divamesh")
+        os.makedirs(logdir, exist_ok=True)
+        with open(logfile, 'ab') as lf:
+            subprocess.run(["./divamesh"], cwd=divadirs.diva2d,
+                           stdout=lf, stderr=subprocess.STDOUT)
 
         # Check if mesh has been created
         if os.path.exists(divafiles.mesh):
@@ -1319,18 +1847,17 @@ class Diva2DMesh(object):
         :type meshplot: list
         """
 
-        # Create empty lists of coordinates
-        xx = []
-        yy = []
-        # Read each element coordinates and add values that will lead to projected values
-        # that will be discarded
-        #
-        # Previous solution: we add a NaN to avoid plotting lines joining 2 elements
-        for j in range(0, self.nelements):
-            xx.extend((self.xnode[self.i1[j]], self.xnode[self.i2[j]],
-                       self.xnode[self.i3[j]], self.xnode[self.i1[j]], np.nan))
-            yy.extend((self.ynode[self.i1[j]], self.ynode[self.i2[j]],
-                       self.ynode[self.i3[j]], self.ynode[self.i1[j]], np.nan))
+        # Gather the coordinates of the 3 vertices of each element (closing the triangle)
+        # and add a NaN to avoid plotting lines joining 2 elements
+        idx = np.stack((self.i1, self.i2, self.i3, self.i1), axis=1)
+        xx = np.empty((self.nelements, 5))
+        xx[:, :4] = self.xnode[idx]
+        xx[:, 4] = np.nan
+        xx = xx.ravel()
+        yy = np.empty((self.nelements, 5))
+        yy[:, :4] = self.ynode[idx]
+        yy[:, 4] = np.nan
+        yy = yy.ravel()
 
         if m is None:
             logger.debug("No projection defined")
@@ -1348,9 +1875,11 @@ class Diva2DMesh(object):
             # (to avoid warnings if we did it through the plot)
             xx, yy = m(xx, yy)
 
-            # Mask large values
-            xx = np.ma.masked_greater(xx, 1e+10, copy=True)
-            yy = np.ma.masked_greater(yy, 1e+10, copy=True)
+            # The projection turns the NaN separators into large values:
+            # set them back to NaN so that the lines are still broken there
+            bad = (xx > 1e+10) | (yy > 1e+10)
+            xx[bad] = np.nan
+            yy[bad] = np.nan
 
             meshplot = m.plot(xx, yy, latlon=False, **kwargs)
 
@@ -1372,6 +1901,7 @@ class Diva2DMesh(object):
             Mesh.add_to_plot_patch(ax, edgecolor='b', facecolor='0.9', linewidth=0.5)
 
         Note that an 'ax' object should exist in order to add the patches to the plot.
+        All the triangles are added at once as a single PolyCollection.
 
         The method 'add_to_plot' uses simple lines and is recommended for meshes
         with a large number of elements.
@@ -1384,37 +1914,46 @@ class Diva2DMesh(object):
         if m is None:
             logger.debug("No projection defined")
             logger.debug('Adding finite-element mesh to plot')
-
-            for j in range(0, self.nelements):
-                verts = [(self.xnode[self.i1[j]], self.ynode[self.i1[j]]),
-                         (self.xnode[self.i2[j]], self.ynode[self.i2[j]]),
-                         (self.xnode[self.i3[j]], self.ynode[self.i3[j]]),
-                         (self.xnode[self.i1[j]], self.ynode[self.i1[j]])]
-
-                meshpath = path.Path(verts)
-                meshpatch = patches.PathPatch(meshpath, **kwargs)
-                ax.add_patch(meshpatch)
-
-            logger.debug('Setting limits to axes')
-            ax.set_xlim(self.xnode.min(), self.xnode.max())
-            ax.set_ylim(self.ynode.min(), self.ynode.max())
+            xnode, ynode = self.xnode, self.ynode
         else:
             logger.debug("Applying projection to coordinates")
             logger.debug('Adding finite-element mesh to map')
             xnode, ynode = m(self.xnode, self.ynode)
             m.ax = ax
-            for j in range(0, self.nelements):
-                verts = [(xnode[self.i1[j]], ynode[self.i1[j]]),
-                         (xnode[self.i2[j]], ynode[self.i2[j]]),
-                         (xnode[self.i3[j]], ynode[self.i3[j]]),
-                         (xnode[self.i1[j]], ynode[self.i1[j]])]
-                meshpath = path.Path(verts)
-                meshpatch = patches.PathPatch(meshpath, **kwargs)
-                m.ax.add_patch(meshpatch)
 
-            logger.debug('Setting limits to axes')
-            m.ax.set_xlim(xnode.min(), xnode.max())
-            m.ax.set_ylim(ynode.min(), ynode.max())
+        # (nelements, 3, 2) array with the (projected) vertices of each triangle,
+        # filled directly from the node coordinates
+        tri_xy = np.empty((self.nelements, 3, 2))
+        for k, inodes in enumerate((self.i1, self.i2, self.i3)):
+            tri_xy[:, k, 0] = xnode[inodes]
+            tri_xy[:, k, 1] = ynode[inodes]
+        ax.add_collection(PolyCollection(tri_xy, **kwargs))
+
+        logger.debug('Setting limits to axes')
+        ax.set_xlim(tri_xy[..., 0].min(), tri_xy[..., 0].max())
+        ax.set_ylim(tri_xy[..., 1].min(), tri_xy[..., 1].max())
+
+    def centroids(self, m=None):
+        """Compute the centroids of all the triangles of the mesh.
+        If numba is installed, they are computed by a compiled, parallel loop.
+
+        Example:
+        =======
+
+            xc, yc = Mesh.centroids()
+
+        :param m: basemap (the centroids of the projected triangles are computed)
+        :type m: mpl_toolkits.basemap.Basemap
+        :return: x- and y-coordinates of the centroids
+        :rtype: tuple of numpy ndarray
+        """
+        if m is None:
+            xnode, ynode = self.xnode, self.ynode
+        else:
+            xnode, ynode = m(self.xnode, self.ynode)
+        centroids = _centroids_loop if _load_numba() else _centroids
+        return centroids(np.asarray(xnode, dtype=np.float64), np.asarray(ynode, dtype=np.float64),
+                         self.i1, self.i2, self.i3)
 
     def add_element_num(self, m=None, **kwargs):
         """Write the element number at the center of each triangle.
@@ -1428,20 +1967,9 @@ class Diva2DMesh(object):
 
         """
 
-        if m is None:
-            for j in range(0, self.nelements):
-                xnodemean = (1. / 3.) * (self.xnode[self.i1[j]] + self.xnode[self.i2[j]] + self.xnode[self.i3[j]])
-                ynodemean = (1. / 3.) * (self.ynode[self.i1[j]] + self.ynode[self.i2[j]] + self.ynode[self.i3[j]])
-                plt.text(xnodemean, ynodemean, str(j + 1),
-                         ha='center', va='center', **kwargs)
-        else:
-            xnode_proj, ynode_proj = m(self.xnode, self.ynode)
-            # m.ax = ax
-            for j in range(0, self.nelements):
-                xnodemean = (1. / 3.) * (xnode_proj[self.i1[j]] + xnode_proj[self.i2[j]] + xnode_proj[self.i3[j]])
-                ynodemean = (1. / 3.) * (ynode_proj[self.i1[j]] + ynode_proj[self.i2[j]] + ynode_proj[self.i3[j]])
-                plt.text(xnodemean, ynodemean, str(j + 1),
-                         ha='center', va='center', **kwargs)
+        xnodemean, ynodemean = self.centroids(m)
+        for j, (xc, yc) in enumerate(zip(xnodemean.tolist(), ynodemean.tolist()), start=1):
+            plt.text(xc, yc, str(j), ha='center', va='center', **kwargs)
 
     def to_geojson(self, filename, varname='mesh'):
         """
@@ -1452,24 +1980,25 @@ class Diva2DMesh(object):
         :type varname: str
         """
 
-        NN = self.nelements
-        verts = []
-        for j in range(0, NN):
-            verts.append([[(self.xnode[self.i1[j]], self.ynode[self.i1[j]]),
-                           (self.xnode[self.i2[j]], self.ynode[self.i2[j]]),
-                           (self.xnode[self.i3[j]], self.ynode[self.i3[j]]),
-                           (self.xnode[self.i1[j]], self.ynode[self.i1[j]])]]
-                         )
-        geojsonmesh = geojson.MultiPolygon(verts)
+        # Vertices of all the triangles (closed), gathered at once: shape (nelements, 4, 2)
+        idx = np.stack((self.i1, self.i2, self.i3, self.i1), axis=1)
+        verts = np.stack((self.xnode[idx], self.ynode[idx]), axis=-1)
+        # One polygon with a single ring per element, coordinates rounded to 6 decimals
+        polygons = np.round(verts, 6)[:, np.newaxis]
 
         try:
             with open(os.path.join(filename), 'w') as f:
                 f.write("".join(("var ", varname, " = ")))
-                out = json.dumps(geojsonmesh, indent=0, separators=(',', ': '))
-                f.write(out)
+                f.write('{"type":"MultiPolygon","coordinates":[')
+                # Serialize the polygons by blocks so that the whole string is never in memory
+                for start in range(0, len(polygons), _GEOJSON_BLOCK):
+                    if start:
+                        f.write(',')
+                    f.write(_json_dumps(polygons[start:start + _GEOJSON_BLOCK], indent=False)[1:-1])
+                f.write(']}')
 
         except FileNotFoundError:
-            logger.error("Directory {} does not exist".format(os.path.basename(filename)))
+            logger.error("Directory %s does not exist", os.path.basename(filename))
             raise FileNotFoundError('Directory does not exist')
 
 
@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 from .pydiva2d import *
+from .pydiva2d import _LazyLogger
 
 __author__ = 'ctroupin'
 """User interface for diva in python
@@ -8,7 +9,7 @@ __author__ = 'ctroupin'
 
 # If we want to have a specific logger for the messages depending on Diva4D
 # Probably not necessary
-logger = divalogger(__name__, logfile)
+logger = _LazyLogger(__name__)
 
 
 class Diva4DDirectories(DivaDirectories):
@@ -27,15 +28,15 @@ class Diva4DDirectories(DivaDirectories):
             self.diva4dmesh = os.path.join(self.diva4d, 'newinput/divamesh/')
             self.diva4dparam = os.path.join(self.diva4d, 'newinput/divaparam/')
 
-            logger.info('Diva 4D input directory: {0}'.format(self.diva4dinput))
-            logger.info('Diva 4D output directory: {0}'.format(self.diva4doutput))
-            logger.info('Diva 4D output 3D directory: {0}'.format(self.diva4doutput3d))
-            logger.info('Diva 4D output fields directory: {0}'.format(self.diva4doutputfields))
-            logger.info('Diva 4D mesh directory: {0}'.format(self.diva4dmesh))
-            logger.info('Diva 4D parameter directory: {0}'.format(self.diva4dparam))
+            logger.info('Diva 4D input directory: %s', self.diva4dinput)
+            logger.info('Diva 4D output directory: %s', self.diva4doutput)
+            logger.info('Diva 4D output 3D directory: %s', self.diva4doutput3d)
+            logger.info('Diva 4D output fields directory: %s', self.diva4doutputfields)
+            logger.info('Diva 4D mesh directory: %s', self.diva4dmesh)
+            logger.info('Diva 4D parameter directory: %s', self.diva4dparam)
 
         else:
-            logging.error("{0} is not a directory or doesn't exist".format(divamain))
+            logger.error("%s is not a directory or doesn't exist", divamain)
 
 
 class Diva4Dfiles(object):
@@ -63,18 +64,18 @@ class Diva4Dfiles(object):
             self.ncdfinfo = os.path.join(self.diva4ddir, 'ncdfinfo')
             self.param = os.path.join(self.diva4ddir, 'input/param.par')
             logger.info("Creating Diva 4D file names and paths")
-            logger.info("datasource file:   {0}".format(self.datasource))
-            logger.info("constandrefe file: {0}".format(self.constandrefe))
-            logger.info("driver file:       {0}".format(self.driver))
-            logger.info("monthlist file:    {0}".format(self.monthlist))
-            logger.info("qflist file:       {0}".format(self.qflist))
-            logger.info("varlist file:      {0}".format(self.varlist))
-            logger.info("yearlist file:     {0}".format(self.yearlist))
-            logger.info("contourdepth file: {0}".format(self.contourdepth))
-            logger.info("ncdfinfo file:     {0}".format(self.ncdfinfo))
-            logger.info("param.par file:    {0}".format(self.param))
+            logger.info("datasource file:   %s", self.datasource)
+            logger.info("constandrefe file: %s", self.constandrefe)
+            logger.info("driver file:       %s", self.driver)
+            logger.info("monthlist file:    %s", self.monthlist)
+            logger.info("qflist file:       %s", self.qflist)
+            logger.info("varlist file:      %s", self.varlist)
+            logger.info("yearlist file:     %s", self.yearlist)
+            logger.info("contourdepth file: %s", self.contourdepth)
+            logger.info("ncdfinfo file:     %s", self.ncdfinfo)
+            logger.info("param.par file:    %s", self.param)
         else:
-            logging.error("%{0} is not a directory or doesn't exist".format(self.diva4ddir))
+            logger.error("%s is not a directory or doesn't exist", self.diva4ddir)
 
 
 class Datasource(object):
@@ -106,7 +107,7 @@ class Datasource(object):
         with open(filename, 'w') as f:
             for datafile in self.datafilelist:
                 f.write(''.join((datafile, '\n')))
-        logger.info("Written into file {0}".format(filename))
+        logger.info("Written into file %s", filename)
 
     def read_from(self, filename):
         """Read the data sources from an existing file containing
@@ -117,9 +118,9 @@ class Datasource(object):
                 for lines in f:
                     self.datafilelist.append(lines.rstrip('\n'))
         except FileNotFoundError:
-            logging.error("File {0} not found".format(filename))
+            logger.error("File %s not found", filename)
 
-        logger.info("Read from file {0}".format(filename))
+        logger.info("Read from file %s", filename)
 
 
 class Constandrefe(object):
@@ -159,7 +160,7 @@ class Constandrefe(object):
         with open(os.path.join(filename), 'w') as f:
             f.write(constandrefe_string)
 
-        logger.info("Written into file {0}".format(filename))
+        logger.info("Written into file %s", filename)
 
     def read_from(self, filename):
         """Get the 'constandrefe' parameters from an existing file.
@@ -169,7 +170,7 @@ class Constandrefe(object):
         :type filename: str
         """
         if os.path.exists(filename):
-            logger.info("Reading 'constandrefe' parameters from file {0}".format(filename))
+            logger.info("Reading 'constandrefe' parameters from file %s", filename)
             # Start with empty list
             constandrefe_param = []
             with open(filename, 'r') as f:
@@ -187,7 +188,7 @@ class Constandrefe(object):
             self.var_year_code = var_year_code
             self.var_month_code = var_month_code
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
 
@@ -278,7 +279,7 @@ class Driver(object):
 
         with open(filename, 'w') as f:
             f.write(driver_string)
-        logger.info("Written into file {0}".format(filename))
+        logger.info("Written into file %s", filename)
 
     def read_from(self, filename):
         """Get the 'driver' parameters from an existing file.
@@ -288,7 +289,7 @@ class Driver(object):
         :type filename: str
         """
         if os.path.exists(filename):
-            logger.info("Reading 'driver' parameters from file {0}".format(filename))
+            logger.info("Reading 'driver' parameters from file %s", filename)
             # Start with empty list
             driver_param = []
             with open(filename, 'r') as f:
@@ -320,7 +321,7 @@ class Driver(object):
             self.gnuplot_flag = int(gnuplot_flag)
             self.detrend_groupnum = int(detrend_groupnum)
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
 
@@ -357,7 +358,7 @@ class Monthlist(object):
         with open(filename, 'w') as f:
             for mm in self.monthlist:
                 f.write(''.join((mm, '\n')))
-        logger.info("Written in file {0}".format(filename))
+        logger.info("Written in file %s", filename)
 
     def read_from(self, filename):
         """Get the 'monthlist' values from an existing file.
@@ -375,7 +376,7 @@ class Monthlist(object):
         :type filename: str
         """
         if os.path.exists(filename):
-            logger.info("Reading 'monthlist' values from file {0}".format(filename))
+            logger.info("Reading 'monthlist' values from file %s", filename)
             # Start with empty list
             self.monthlist = []
             with open(filename, 'r') as f:
@@ -385,7 +386,7 @@ class Monthlist(object):
                     self.monthlist.append(line.rstrip())
                     line = f.readline()
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
 
@@ -421,7 +422,7 @@ class Qflist(object):
         with open(filename, 'w') as f:
             for qf in self.qflist:
                 f.write(''.join((str(qf), '\n')))
-        logger.info("Written in file {0}".format(filename))
+        logger.info("Written in file %s", filename)
 
     def read_from(self, filename):
         """Get the 'qflist' values from an existing file.
@@ -439,7 +440,7 @@ class Qflist(object):
         :type filename: str
         """
         if os.path.exists(filename):
-            logger.info("Reading 'qflist' values from file {0}".format(filename))
+            logger.info("Reading 'qflist' values from file %s", filename)
             # Start with empty list
             self.qflist = []
             with open(filename, 'r') as f:
@@ -449,7 +450,7 @@ class Qflist(object):
                     self.qflist.append(int(line.rstrip()))
                     line = f.readline()
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
 
@@ -488,7 +489,7 @@ class Varlist(object):
             for variables in self.varlist:
                 f.write(''.join((variables, '\n')))
 
-        logger.info("Written in file {0}".format(filename))
+        logger.info("Written in file %s", filename)
 
     def read_from(self, filename):
         """Get the list of variables from an existing file.
@@ -506,7 +507,7 @@ class Varlist(object):
         :type filename: str
         """
         if os.path.exists(filename):
-            logger.info("Reading list of variables from file {0}".format(filename))
+            logger.info("Reading list of variables from file %s", filename)
             # Start with empty list
             self.varlist = []
             with open(filename, 'r') as f:
@@ -516,7 +517,7 @@ class Varlist(object):
                     self.varlist.append(line.rstrip())
                     line = f.readline()
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
 
@@ -552,7 +553,7 @@ class Yearlist(object):
             for years in self.yearlist:
                 f.write(''.join((years, '\n')))
 
-        logger.info("Written into file {0}".format(filename))
+        logger.info("Written into file %s", filename)
 
     def read_from(self, filename):
         """Get the list of year periods from an existing file.
@@ -570,7 +571,7 @@ class Yearlist(object):
         :type filename: str
         """
         if os.path.exists(filename):
-            logger.info("Reading list of variables from file {0}".format(filename))
+            logger.info("Reading list of variables from file %s", filename)
             # Start with empty list
             self.yearlist = []
             with open(filename, 'r') as f:
@@ -580,7 +581,7 @@ class Yearlist(object):
                     self.yearlist.append(line.rstrip())
                     line = f.readline()
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
 
@@ -623,7 +624,7 @@ class Contourdepth(object):
             for depths in self.depthlist:
                 f.write(''.join((str(depths), '\n')))
 
-        logger.info("Written into file {0}".format(filename))
+        logger.info("Written into file %s", filename)
 
     def read_from(self, filename):
         """Get the depth contour from an already existing 'contour.depth' file.
@@ -632,7 +633,7 @@ class Contourdepth(object):
         """
         depthlist = []
         if os.path.exists(filename):
-            logger.info("Reading depth levels from file {0}".format(filename))
+            logger.info("Reading depth levels from file %s", filename)
             with open(filename, 'r') as f:
                 line = f.readline()
                 while len(line) > 0:
@@ -640,7 +641,7 @@ class Contourdepth(object):
                     line = f.readline()
             self.depthlist = depthlist
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
 
 
@@ -717,7 +718,7 @@ class Ncdfinfo(object):
         with open(filename, 'w') as f:
             f.write(ncdfinfo_string)
 
-        logger.info("Written into file {0}".format(filename))
+        logger.info("Written into file %s", filename)
 
     def read_from(self, filename):
         """Get the netCDF metadata information from an existing 'Ncdfinfo' file.
@@ -727,7 +728,7 @@ class Ncdfinfo(object):
         :type filename: str
         """
         if os.path.exists(filename):
-            logger.info("Reading netCDF metadata from file {0}".format(filename))
+            logger.info("Reading netCDF metadata from file %s", filename)
             # Start with empty list
             ncdfinfo = []
             with open(filename, 'r') as f:
@@ -740,5 +741,5 @@ class Ncdfinfo(object):
                 self.institution, self.groupemail, self.source, self.comment,\
                 self.authoremail, self.acknowledgment = ncdfinfo[1::2]
         else:
-            logger.error("File {0} does not exist".format(filename))
+            logger.error("File %s does not exist", filename)
             raise FileNotFoundError('File does not exist')
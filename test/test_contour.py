@@ -64,6 +64,31 @@ class TestContourMethods(unittest.TestCase):
         self.assertEqual(len(contour.y[1]), 16)
         self.assertEqual(len(contour.x[-1]), 6)
 
+    def test_points_number(self):
+        """
+        Count the points of sub-contours of different lengths
+        """
+        contour = pydiva2d.Diva2DContours(self.xlist, self.ylist)
+        self.assertEqual(contour.get_points_number, [3, 4])
+        np.testing.assert_array_equal(contour.x[1], self.xlist[1])
+        np.testing.assert_array_equal(contour.y[0], self.ylist[0])
+
+    def test_closed_contours(self):
+        """
+        Close the sub-contours by appending their first point
+        """
+        contour = pydiva2d.Diva2DContours(self.xx, self.yy)
+        xclosed, yclosed = contour.get_closed_contours()
+        self.assertEqual(len(xclosed), 2)
+        self.assertEqual(len(xclosed[0]), 5)
+        self.assertEqual(xclosed[1][-1], 6.3)
+        self.assertEqual(yclosed[1][-1], -1.)
+        self.assertIs(contour.get_closed_contours()[0], xclosed)
+
+        contour.x = self.yy
+        xclosed, yclosed = contour.get_closed_contours()
+        self.assertEqual(xclosed[1][-1], -1.)
+
     def test_read_nonexisting_file(self):
         """
         Try instantiate Contour object reading an non-existing file
@@ -1,6 +1,7 @@
 import numpy as np
 from pydiva import pydiva2d
 import os
+import json
 import unittest
 
 print("Running tests on Diva data")
@@ -21,8 +22,11 @@ class TestDivaData(unittest.TestCase):
         cls.yarray2 = np.array((1., 10., -1, 3.))
         cls.datarray = np.array((7., 8., 9.))
         cls.weightarray = np.array((1., 1., 1.))
+        cls.datafile = "../data/MLD1.dat"
+        cls.nodatafile = "../data/nodata.dat"
         cls.nogeojsonfile = "./nodata/data.js"
         cls.outputfile = "./datawrite/data.dat"
+        cls.weightfile = "./datawrite/data_weights.dat"
         cls.geojsonfile = "./datawrite/data.js"
 
     def test_init_data(self):
@@ -73,6 +77,77 @@ class TestDivaData(unittest.TestCase):
             self.assertEqual(float(lastline.split()[0]), 2.1)
             self.assertEqual(len(lines), 3)
 
+    def test_write_read_precision(self):
+        """
+        Write data points to a file and read them back without loss of precision
+        """
+        data = pydiva2d.Diva2DData([512345.678912, 2.1], [6123456.789012, -1.], [1.23456789012, 0.])
+        data.write_to(self.outputfile)
+        dataread = pydiva2d.Diva2DData().read_from(self.outputfile)
+        np.testing.assert_array_equal(dataread.x, data.x)
+        np.testing.assert_array_equal(dataread.y, data.y)
+        np.testing.assert_array_equal(dataread.field, data.field)
+
+    def test_read_file(self):
+        """
+        Instantiate Data object reading an existing file
+        """
+        data = pydiva2d.Diva2DData().read_from(self.datafile)
+        self.assertEqual(data.count_data, 197)
+        self.assertEqual(data.x[1], 38.983)
+        self.assertEqual(data.y[1], 43.982)
+        self.assertEqual(data.field[1], -37.854861)
+        np.testing.assert_array_equal(data.weight, np.ones(197))
+
+    def test_read_file_lines(self):
+        """
+        Instantiate Data object reading an existing file line by line
+        """
+        data = pydiva2d.Diva2DData().read_from(self.datafile)
+        datalines = pydiva2d.Diva2DData().read_from_lines(self.datafile)
+        np.testing.assert_array_equal(datalines.x, data.x)
+        np.testing.assert_array_equal(datalines.y, data.y)
+        np.testing.assert_array_equal(datalines.field, data.field)
+        np.testing.assert_array_equal(datalines.weight, data.weight)
+
+    def test_read_file_partial_weights(self):
+        """
+        Read a data file where the weight is not provided on the first line
+        """
+        with open(self.weightfile, 'w') as f:
+            f.write("1. 2. 3.\n4. 5. 6. 0.5\n7. 8. 9. 2.\n")
+        data = pydiva2d.Diva2DData().read_from(self.weightfile)
+        np.testing.assert_array_equal(data.field, [3., 6., 9.])
+        np.testing.assert_array_equal(data.weight, [1., 0.5, 2.])
+
+    def test_read_file_blank_line(self):
+        """
+        Check that the reading stops at the first blank line
+        """
+        with open(self.weightfile, 'w') as f:
+            f.write("1 2 3\n5 6 7\n\n8 9 10\n")
+        data = pydiva2d.Diva2DData().read_from(self.weightfile)
+        datalines = pydiva2d.Diva2DData().read_from_lines(self.weightfile)
+        self.assertEqual(data.count_data, 2)
+        self.assertEqual(datalines.count_data, 2)
+        np.testing.assert_array_equal(data.field, [3., 7.])
+
+    def test_read_file_fortran_exponent(self):
+        """
+        Check that the values with Fortran exponents are rejected
+        """
+        with open(self.weightfile, 'w') as f:
+            f.write("1. 2. 3.D0\n")
+        self.assertRaises(ValueError,
+                          lambda: pydiva2d.Diva2DData().read_from_lines(self.weightfile))
+
+    def test_read_nonexisting_file(self):
+        """
+        Try instantiate Data object reading an non-existing file
+        """
+        self.assertRaises(FileNotFoundError,
+                          lambda: pydiva2d.Diva2DData().read_from(self.nodatafile))
+
     def test_write_nonexisting_geojson(self):
         """
         Check if geoJSON is properly created from data
@@ -106,6 +181,25 @@ class TestDivaData(unittest.TestCase):
         self.assertEqual(line0, "var divadata = {")
         self.assertEqual(len(lines), 47)
 
+    def test_write_geojson_encoders(self):
+        """
+        Check that the geoJSON has the same content with and without orjson
+        """
+        data = pydiva2d.Diva2DData([1e16, 2.1], [0.00001, -1.], [1.23456789012, 0.])
+        orjson = pydiva2d.orjson
+        contents = []
+        try:
+            for encoder in (orjson, None):
+                pydiva2d.orjson = encoder
+                data.to_geojson(filename=self.geojsonfile)
+                with open(self.geojsonfile) as f:
+                    contents.append(json.loads(f.read().split(" = ", 1)[1]))
+        finally:
+            pydiva2d.orjson = orjson
+
+        self.assertEqual(contents[0], contents[1])
+        self.assertEqual(contents[1]["features"][0]["geometry"]["coordinates"], [1e16, 0.00001])
+
     @classmethod
     def tearDownClass(cls):
         print("Tearing down...")
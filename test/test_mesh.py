@@ -1,7 +1,10 @@
+import numpy as np
 from pydiva import pydiva2d
 import unittest
 import subprocess
 import os
+import json
+import matplotlib.pyplot as plt
 
 
 print("Running tests on Diva mesh")
@@ -45,6 +48,7 @@ class TestMeshMethods(unittest.TestCase):
         self.assertEqual(len(squaremesh.i1), len(squaremesh.i2))
         self.assertEqual(len(squaremesh.i2), len(squaremesh.i3))
         self.assertEqual(squaremesh.i1[6], 43)
+        self.assertEqual(squaremesh.i1.dtype, np.int32)
 
     def test_read_file_numpy(self):
         """
@@ -59,6 +63,44 @@ class TestMeshMethods(unittest.TestCase):
         self.assertEqual(len(squaremesh.i1), len(squaremesh.i2))
         self.assertEqual(len(squaremesh.i2), len(squaremesh.i3))
         self.assertEqual(squaremesh.i1[6], 43)
+        self.assertEqual(squaremesh.i1.dtype, np.int32)
+
+    def test_centroids(self):
+        """
+        Compute the centroids of the triangles of an existing mesh
+        """
+        squaremesh = pydiva2d.Diva2DMesh().read_from(self.meshfile, self.meshtopofile)
+        xc, yc = squaremesh.centroids()
+        self.assertEqual(len(xc), squaremesh.nelements)
+        self.assertAlmostEqual(xc[0], (squaremesh.xnode[squaremesh.i1[0]] +
+                                       squaremesh.xnode[squaremesh.i2[0]] +
+                                       squaremesh.xnode[squaremesh.i3[0]]) / 3.)
+        np.testing.assert_allclose(yc, (squaremesh.ynode[squaremesh.i1] +
+                                        squaremesh.ynode[squaremesh.i2] +
+                                        squaremesh.ynode[squaremesh.i3]) / 3.)
+
+    def test_centroids_list(self):
+        """
+        Compute the centroids of a mesh defined with lists
+        """
+        mesh = pydiva2d.Diva2DMesh(4, 0, 2, [0., 3., 0., 3.], [0., 0., 3., 3.],
+                                   [0, 1], [1, 3], [2, 2])
+        xc, yc = mesh.centroids()
+        np.testing.assert_allclose(xc, [1., 2.])
+        np.testing.assert_allclose(yc, [1., 2.])
+
+    def test_plot_list(self):
+        """
+        Plot a mesh defined with lists
+        """
+        mesh = pydiva2d.Diva2DMesh(4, 0, 2, [0., 3., 0., 3.], [0., 0., 3., 3.],
+                                   [0, 1], [1, 3], [2, 2])
+        meshplot = mesh.add_to_plot()
+        self.assertEqual(len(meshplot[0].get_xdata()), 10)
+        ax = plt.subplot(111)
+        mesh.add_to_plot_patch(ax)
+        self.assertEqual(len(ax.collections[-1].get_paths()), 2)
+        plt.close()
 
     def test_read_nonexisting_file(self):
         """
@@ -109,8 +151,11 @@ class TestMeshMethods(unittest.TestCase):
             lines = f.readlines()
             line0 = lines[0].rstrip()
 
-        self.assertEqual(line0, "var mesh = {")
-        self.assertEqual(len(lines), 6965)
+        self.assertTrue(line0.startswith("var mesh = {"))
+        self.assertEqual(len(lines), 1)
+        geojsonmesh = json.loads(line0[len("var mesh = "):])
+        self.assertEqual(geojsonmesh["type"], "MultiPolygon")
+        self.assertEqual(len(geojsonmesh["coordinates"]), 348)
 
         squaremesh.to_geojson(filename=self.geojsonfile, varname="divamesh")
         self.assertTrue(os.path.exists(self.geojsonfile))
@@ -119,8 +164,22 @@ class TestMeshMethods(unittest.TestCase):
             lines = f.readlines()
             line0 = lines[0].rstrip()
 
-        self.assertEqual(line0, "var divamesh = {")
-        self.assertEqual(len(lines), 6965)
+        self.assertTrue(line0.startswith("var divamesh = {"))
+        self.assertEqual(len(lines), 1)
+        geojsonmesh = json.loads(line0[len("var divamesh = "):])
+        self.assertEqual(geojsonmesh["type"], "MultiPolygon")
+        self.assertEqual(len(geojsonmesh["coordinates"]), 348)
+
+        # Mesh defined with lists
+        mesh = pydiva2d.Diva2DMesh(4, 0, 2, [0., 3., 0., 3.], [0., 0., 3., 3.],
+                                   [0, 1], [1, 3], [2, 2])
+        mesh.to_geojson(filename=self.geojsonfile)
+
+        with open(self.geojsonfile) as f:
+            geojsonmesh = json.loads(f.read()[len("var mesh = "):])
+
+        self.assertEqual(geojsonmesh["coordinates"][1],
+                         [[[3., 0.], [3., 3.], [0., 3.], [3., 0.]]])
 
     @classmethod
     def tearDownClass(cls):
@@ -2,6 +2,7 @@ import os
 import numpy as np
 from pydiva import pydiva2d
 import subprocess
+import shutil
 import unittest
 
 print("Running tests on Diva results")
@@ -14,14 +15,15 @@ class TestResultMethods(unittest.TestCase):
     def setUpClass(cls):
         cls.xx = np.array((1, 2, 3))
         cls.yy = np.array((0, 1))
-        cls.zz = np.random.rand(3, 2)
-        cls.ee = np.random.rand(3, 2)
-        cls.eebad = np.random.rand(2, 3)
+        cls.zz = np.random.rand(2, 3)
+        cls.ee = np.random.rand(2, 3)
+        cls.eebad = np.random.rand(3, 2)
         cls.divadir = "/home/ctroupin/Software/DIVA/DIVA-diva-4.7.1/"
         cls.datafile = "../data/MLD1.dat"
         cls.coastfile = "../data/coast.cont"
         cls.paramfile = "../data/param.par"
         cls.resultfile = "./dataread/resultsquare.nc"
+        cls.resultfilenoerror = "./dataread/testresult.nc"
         cls.noresultfile = "./dataread/noresult.nc"
         cls.outputfile = "./datawrite/testresult.nc"
         cls.nogeojsonfile = "./nodata/results.js"
@@ -55,10 +57,10 @@ class TestResultMethods(unittest.TestCase):
         """
         Instantiate object with arrays of different length
         """
-        self.assertRaises(Exception,
+        self.assertRaises(ValueError,
                           lambda: pydiva2d.Diva2DResults(self.xx, self.yy, self.zz, self.eebad))
 
-        self.assertRaises(Exception,
+        self.assertRaises(ValueError,
                           lambda: pydiva2d.Diva2DResults(self.xx, self.xx, self.zz, self.eebad))
 
     def test_read_nonexisting_file(self):
@@ -82,6 +84,86 @@ class TestResultMethods(unittest.TestCase):
         self.assertEqual(results.error.min(), 0.7073806524276733)
         self.assertEqual(results.analysis.shape, (101, 101))
 
+    def test_init_from_file(self):
+        """
+        Instantiate Result object with the arrays read from a file (fields are (ny, nx))
+        """
+        results = pydiva2d.Diva2DResults().read_from(self.resultfilenoerror)
+        self.assertEqual(results.analysis.shape, (len(results.y), len(results.x)))
+        results_copy = pydiva2d.Diva2DResults(results.x, results.y, results.analysis)
+        self.assertTrue(np.ma.isMaskedArray(results_copy.analysis))
+        np.testing.assert_array_equal(results_copy.analysis, results.analysis)
+        self.assertRaises(ValueError,
+                          lambda: pydiva2d.Diva2DResults(results.x, results.y, results.analysis.T))
+
+    def test_read_file_noerror(self):
+        """
+        Check that the error is not defined when absent from the file
+        """
+        results = pydiva2d.Diva2DResults().read_from(self.resultfilenoerror)
+        self.assertEqual(results.analysis.ndim, 2)
+        self.assertIsNone(results.error)
+        self.assertIsNone(results.add_to_plot(field='error'))
+
+    def test_read_file_cached(self):
+        """
+        Check that reading the same file twice gives the same read-only cached arrays
+        """
+        results1 = pydiva2d.Diva2DResults().read_from(self.resultfile)
+        results2 = pydiva2d.Diva2DResults().read_from(self.resultfile)
+        self.assertIs(results1.analysis, results2.analysis)
+        self.assertFalse(results2.analysis.flags.writeable)
+        self.assertIn(os.path.abspath(self.resultfile), pydiva2d._result_cache)
+
+        pydiva2d.clear_result_cache(self.resultfile)
+        self.assertNotIn(os.path.abspath(self.resultfile), pydiva2d._result_cache)
+
+    def test_read_file_cache_size(self):
+        """
+        Check that the cache keeps at most _RESULT_CACHE_SIZE files
+        """
+        pydiva2d.clear_result_cache()
+        resultfiles = []
+        for i in range(pydiva2d._RESULT_CACHE_SIZE + 1):
+            resultfiles.append("./datawrite/cached{0}.nc".format(i))
+            shutil.copy2(self.resultfile, resultfiles[-1])
+            pydiva2d.Diva2DResults().read_from(resultfiles[-1])
+
+        self.assertEqual(len(pydiva2d._result_cache), pydiva2d._RESULT_CACHE_SIZE)
+        self.assertNotIn(os.path.abspath(resultfiles[0]), pydiva2d._result_cache)
+        pydiva2d.clear_result_cache()
+        for resultfile in resultfiles:
+            os.remove(resultfile)
+
+    def test_clear(self):
+        """
+        Check that the fields and the cached content of the file are released
+        """
+        results = pydiva2d.Diva2DResults().read_from(self.resultfile)
+        analysis = results.analysis
+        results.clear()
+        self.assertIsNone(results.x)
+        self.assertIsNone(results.analysis)
+        self.assertIsNone(results.error)
+        self.assertNotIn(os.path.abspath(self.resultfile), pydiva2d._result_cache)
+        results.read_from(self.resultfile)
+        np.testing.assert_array_equal(results.analysis, analysis)
+
+    def test_plot(self):
+        """
+        Check the artist used to plot the results on a regular grid
+        """
+        results = pydiva2d.Diva2DResults().read_from(self.resultfilenoerror)
+        self.assertTrue(pydiva2d._is_linspace(results.x))
+        self.assertEqual(type(results.add_to_plot(cmap='RdYlBu_r')).__name__, 'AxesImage')
+        self.assertEqual(type(results.add_to_plot(shading='auto')).__name__, 'QuadMesh')
+
+        # Descending coordinates and wrong shapes are not drawn as images
+        results_desc = pydiva2d.Diva2DResults(results.x[::-1], results.y, results.analysis[:, ::-1])
+        self.assertEqual(type(results_desc.add_to_plot()).__name__, 'QuadMesh')
+        results.analysis = results.analysis.T
+        self.assertRaises(Exception, lambda: results.add_to_plot())
+
     def test_make(self):
         """
         Check the results of the divacalc execution with selected files
@@ -124,7 +206,7 @@ class TestResultMethods(unittest.TestCase):
             line0 = lines[0].rstrip()
 
         self.assertEqual(line0, "var results = {")
-        self.assertEqual(len(lines), 2058)
+        self.assertEqual(len(lines), 2013)
 
         results.to_geojson(filename=self.geojsonfile, varname="divaresults")
         self.assertTrue(os.path.exists(self.geojsonfile))
@@ -134,7 +216,7 @@ class TestResultMethods(unittest.TestCase):
             line0 = lines[0].rstrip()
 
         self.assertEqual(line0, "var divaresults = {")
-        self.assertEqual(len(lines), 2058)
+        self.assertEqual(len(lines), 2013)
 
         results.to_geojson(filename=self.geojsonfile, levels=np.linspace(0, 0.5, 10))
         self.assertTrue(os.path.exists(self.geojsonfile))
@@ -144,7 +226,21 @@ class TestResultMethods(unittest.TestCase):
             line0 = lines[0].rstrip()
 
         self.assertEqual(line0, "var results = {")
-        self.assertEqual(len(lines), 2048)
+        self.assertEqual(len(lines), 2037)
+
+    def test_write_geojson_constant(self):
+        """
+        Check that no contour is written for a constant field
+        """
+        results = pydiva2d.Diva2DResults(self.xx, self.yy, np.ones_like(self.zz))
+        results.to_geojson(filename=self.geojsonfile)
+
+        with open(self.geojsonfile) as f:
+            lines = f.readlines()
+
+        self.assertEqual(lines[0].rstrip(), "var results = {")
+        self.assertEqual(lines[2].strip(), '"features": []')
+        self.assertEqual(len(lines), 4)
 
     @classmethod
     def tearDownClass(cls):